@@ -0,0 +1,167 @@
+"""
+Compact storage encoding for UploadResult rows.
+
+With ``COMPACT_RESULT_STORAGE`` enabled, results are written as:
+
+- coordinates as int32 microdegrees (``lat_e6``/``lng_e6``), which keeps
+  ~0.1 m precision in 8 bytes instead of two doubles
+- the result type as a small integer (``kind``)
+- EXIF tags as a zlib-compressed binary blob (``exif_blob``) in which known
+  tag names are replaced by their index in a shared tag dictionary and
+  compression is primed with the same dictionary
+
+The blob is only decoded when the EXIF payload is actually requested.
+"""
+import zlib
+from typing import Dict, Optional, Tuple
+
+COORD_SCALE = 1_000_000
+
+KIND_EXIF = 1
+KIND_ESTIMATE = 2
+RESULT_KINDS = {
+    'EXIF': KIND_EXIF,
+    'ESTIMATE': KIND_ESTIMATE,
+}
+KIND_NAMES = {kind: name for name, kind in RESULT_KINDS.items()}
+
+_GPS_TAG_NAMES = [
+    'GPSVersionID', 'GPSLatitudeRef', 'GPSLatitude', 'GPSLongitudeRef',
+    'GPSLongitude', 'GPSAltitudeRef', 'GPSAltitude', 'GPSTimeStamp',
+    'GPSSatellites', 'GPSStatus', 'GPSMeasureMode', 'GPSDOP', 'GPSSpeedRef',
+    'GPSSpeed', 'GPSTrackRef', 'GPSTrack', 'GPSImgDirectionRef',
+    'GPSImgDirection', 'GPSMapDatum', 'GPSDestLatitudeRef', 'GPSDestLatitude',
+    'GPSDestLongitudeRef', 'GPSDestLongitude', 'GPSDestBearingRef',
+    'GPSDestBearing', 'GPSDestDistanceRef', 'GPSDestDistance',
+    'GPSProcessingMethod', 'GPSAreaInformation', 'GPSDateStamp',
+    'GPSDifferential', 'GPSHPositioningError', 'GPSDate',
+]
+
+# exifread prefixes tag names with their IFD ("GPS GPSLatitude"), Pillow
+# does not ("GPSLatitude"). Stored blobs reference entries by index, so this
+# list is append-only: never reorder or remove entries.
+EXIF_TAG_DICTIONARY = tuple(['GPS ' + name for name in _GPS_TAG_NAMES] + _GPS_TAG_NAMES)
+_TAG_CODES = {name: index + 1 for index, name in enumerate(EXIF_TAG_DICTIONARY)}
+
+# Preset zlib dictionary of common values. Changing it makes existing blobs
+# undecodable, so a new dictionary needs a new format version.
+_ZLIB_DICTIONARY = b'WGS-84 GPS 0 1 2 N S E W [0, 0, 0] 2.2.0.0 '
+
+EXIF_FORMAT_VERSION = 1
+
+
+def encode_coordinate(value: Optional[float]) -> Optional[int]:
+    """
+    Convert decimal degrees to integer microdegrees.
+    """
+    if value is None:
+        return None
+    return int(round(value * COORD_SCALE))
+
+
+def decode_coordinate(value: Optional[int]) -> Optional[float]:
+    """
+    Convert integer microdegrees to decimal degrees.
+    """
+    if value is None:
+        return None
+    return value / COORD_SCALE
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _write_string(out: bytearray, value: str) -> None:
+    encoded = value.encode('utf-8')
+    _write_varint(out, len(encoded))
+    out += encoded
+
+
+def _read_string(data: bytes, pos: int) -> Tuple[str, int]:
+    length, pos = _read_varint(data, pos)
+    return data[pos:pos + length].decode('utf-8'), pos + length
+
+
+def encode_exif(exif: Optional[Dict[str, str]]) -> Optional[bytes]:
+    """
+    Encode an EXIF tag dictionary into a compact binary blob.
+
+    Args:
+        exif: Mapping of tag name to stringified value
+
+    Returns:
+        Versioned, compressed blob or None for an empty payload
+    """
+    if not exif:
+        return None
+
+    payload = bytearray()
+    for name, value in exif.items():
+        name = str(name)
+        code = _TAG_CODES.get(name, 0)
+        _write_varint(payload, code)
+        if code == 0:
+            _write_string(payload, name)
+        _write_string(payload, str(value))
+
+    compressor = zlib.compressobj(9, zdict=_ZLIB_DICTIONARY)
+    compressed = compressor.compress(bytes(payload)) + compressor.flush()
+    return bytes([EXIF_FORMAT_VERSION]) + compressed
+
+
+def decode_exif(blob: Optional[bytes]) -> Optional[Dict[str, str]]:
+    """
+    Decode a blob produced by encode_exif.
+    """
+    if not blob:
+        return None
+
+    blob = bytes(blob)
+    if blob[0] != EXIF_FORMAT_VERSION:
+        raise ValueError(f'Unsupported EXIF blob version {blob[0]}')
+
+    decompressor = zlib.decompressobj(zdict=_ZLIB_DICTIONARY)
+    payload = decompressor.decompress(blob[1:]) + decompressor.flush()
+
+    exif = {}
+    pos = 0
+    while pos < len(payload):
+        code, pos = _read_varint(payload, pos)
+        if code == 0:
+            name, pos = _read_string(payload, pos)
+        else:
+            name = EXIF_TAG_DICTIONARY[code - 1]
+        exif[name], pos = _read_string(payload, pos)
+    return exif
+
+
+def compact_fields(result_type: str, latitude: float, longitude: float,
+                   exif: Optional[Dict[str, str]]) -> Dict[str, object]:
+    """
+    Return compact UploadResult field values, with the legacy columns cleared.
+    """
+    return {
+        'kind': RESULT_KINDS[result_type],
+        'lat_e6': encode_coordinate(latitude),
+        'lng_e6': encode_coordinate(longitude),
+        'exif_blob': encode_exif(exif),
+        'result_type': None,
+        'latitude': None,
+        'longitude': None,
+        'exif_data': None,
+    }
@@ -0,0 +1,88 @@
+"""
+Content-coding negotiation and strong ETags for result endpoints.
+
+The ETag is the SHA-256 of the canonical JSON form of the response data plus
+the negotiated media type, so every representation (JSON, MessagePack, CBOR)
+has its own tag and an unchanged result keeps the same tag across requests
+and workers. The compression middleware appends a content-coding suffix to
+the tag (``"<hash>-gzip"``); matching strips it again so clients that cached
+a compressed representation still get a 304, carrying the suffixed tag.
+"""
+import hashlib
+import json
+from typing import Optional, Set
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+ENCODING_SUFFIXES = {
+    'gzip': '-gzip',
+    'br': '-br',
+}
+
+
+def accepted_codings(header: str) -> Set[str]:
+    """
+    Return the content codings accepted by an Accept-Encoding header.
+
+    Codings listed with ``q=0`` are explicitly refused and left out.
+    """
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if coding.strip():
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def content_etag(data, media_type: str) -> str:
+    """
+    Return a quoted strong ETag for response data in a given media type.
+    """
+    canonical = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':'))
+    digest = hashlib.sha256(f'{media_type}\n{canonical}'.encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+
+def with_encoding_suffix(etag: str, coding: str) -> str:
+    """
+    Tag a strong ETag with the content coding applied to the body.
+    """
+    if not etag.startswith('"'):
+        return etag  # Weak tags already compare equal across codings
+    return etag[:-1] + ENCODING_SUFFIXES[coding] + '"'
+
+
+def _strip_encoding_suffix(etag: str) -> str:
+    for suffix in ENCODING_SUFFIXES.values():
+        if etag.endswith(suffix + '"'):
+            return etag[:-len(suffix) - 1] + '"'
+    return etag
+
+
+def matching_etag(request, etag: str) -> Optional[str]:
+    """
+    Check the request's If-None-Match header against an ETag.
+
+    Returns the matching tag as the client sent it (without any weak prefix),
+    so a 304 repeats the coding suffix of the cached 200, or None if nothing
+    matches.
+    """
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return None
+    if header.strip() == '*':
+        return etag
+
+    # If-None-Match uses the weak comparison function (RFC 9110 13.1.2)
+    for candidate in header.split(','):
+        candidate = candidate.strip().removeprefix('W/')
+        if _strip_encoding_suffix(candidate) == etag:
+            return candidate
+    return None
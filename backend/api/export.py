@@ -0,0 +1,201 @@
+"""
+Streaming bulk export of stored upload results.
+
+Rows are read through ``QuerySet.iterator()`` (a server-side cursor on
+PostgreSQL) and encoded one at a time, so memory use does not depend on the
+number of rows exported. Under ASGI the stream is wrapped by
+``aiter_stream()``; Django would otherwise collect a synchronous iterator
+into a list before sending it.
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List
+
+from asgiref.sync import sync_to_async
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .compact import KIND_NAMES, decode_coordinate, decode_exif
+
+EXPORT_FIELDS = [
+    'id', 'created_at', 'file_name', 'file_size', 'result_type',
+    'latitude', 'longitude', 'accuracy', 'confidence'
+]
+
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'geojson': 'application/geo+json',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+# Encoded rows are joined into chunks of roughly this size before being
+# handed to the WSGI server
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+def get_export_fields(include_exif: bool) -> List[str]:
+    """
+    Return the model fields included in an export.
+    """
+    if include_exif:
+        return EXPORT_FIELDS + ['exif_data']
+    return list(EXPORT_FIELDS)
+
+
+def iter_result_rows(queryset, fields: List[str], chunk_size: int) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over result rows as dictionaries without caching the queryset.
+
+    Rows in the compact representation are mapped back onto the export
+    fields; the EXIF blob is only selected and decoded when requested.
+    """
+    include_exif = 'exif_data' in fields
+    columns = fields + ['kind', 'lat_e6', 'lng_e6']
+    if include_exif:
+        columns.append('exif_blob')
+
+    for row in queryset.values(*columns).iterator(chunk_size=chunk_size):
+        if row['kind'] is not None:
+            row['result_type'] = KIND_NAMES[row['kind']]
+            row['latitude'] = decode_coordinate(row['lat_e6'])
+            row['longitude'] = decode_coordinate(row['lng_e6'])
+            if include_exif:
+                row['exif_data'] = decode_exif(row['exif_blob'])
+        yield {field: row[field] for field in fields}
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, cls=DjangoJSONEncoder, separators=(',', ':'))
+
+
+def encode_ndjson(rows: Iterable[Dict[str, Any]], fields: List[str]) -> Iterator[str]:
+    """
+    Encode rows as newline-delimited JSON objects.
+    """
+    for row in rows:
+        yield _dumps(row) + '\n'
+
+
+def encode_geojson(rows: Iterable[Dict[str, Any]], fields: List[str]) -> Iterator[str]:
+    """
+    Encode rows as a GeoJSON FeatureCollection of Point features.
+    """
+    yield '{"type":"FeatureCollection","features":['
+    separator = ''
+    for row in rows:
+        properties = {
+            key: value for key, value in row.items()
+            if key not in ('latitude', 'longitude')
+        }
+        feature = {
+            'type': 'Feature',
+            'geometry': {
+                'type': 'Point',
+                'coordinates': [row['longitude'], row['latitude']],
+            },
+            'properties': properties,
+        }
+        yield separator + _dumps(feature)
+        separator = ','
+    yield ']}\n'
+
+
+def encode_csv(rows: Iterable[Dict[str, Any]], fields: List[str]) -> Iterator[str]:
+    """
+    Encode rows as CSV with a header row. EXIF data is written as JSON text.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(fields)
+    for row in rows:
+        if 'exif_data' in row and row['exif_data'] is not None:
+            row['exif_data'] = _dumps(row['exif_data'])
+        created_at = row.get('created_at')
+        if created_at is not None:
+            row['created_at'] = created_at.isoformat()
+        writer.writerow([row[field] for field in fields])
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+
+EXPORT_ENCODERS = {
+    'ndjson': encode_ndjson,
+    'geojson': encode_geojson,
+    'csv': encode_csv,
+}
+
+
+def buffer_stream(pieces: Iterable[str], size: int = STREAM_BUFFER_SIZE) -> Iterator[bytes]:
+    """
+    Join small encoded pieces into larger byte chunks.
+    """
+    pending = []
+    pending_size = 0
+    for piece in pieces:
+        pending.append(piece)
+        pending_size += len(piece)
+        if pending_size >= size:
+            yield ''.join(pending).encode('utf-8')
+            pending = []
+            pending_size = 0
+    if pending:
+        yield ''.join(pending).encode('utf-8')
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Compress a byte stream into gzip format on the fly.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(queryset, export_format: str, include_exif: bool,
+                  chunk_size: int, compress: bool) -> Iterator[bytes]:
+    """
+    Build the full byte stream for an export.
+
+    Args:
+        queryset: Filtered UploadResult queryset
+        export_format: One of ``EXPORT_ENCODERS``
+        include_exif: Whether to include the EXIF payload
+        chunk_size: Rows fetched per database round trip
+        compress: Whether to gzip the output
+
+    Returns:
+        Iterator of byte chunks
+    """
+    fields = get_export_fields(include_exif)
+    rows = iter_result_rows(queryset, fields, chunk_size)
+    stream = buffer_stream(EXPORT_ENCODERS[export_format](rows, fields))
+    if compress:
+        stream = gzip_stream(stream)
+    return stream
+
+
+async def aiter_stream(stream: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Adapt an export stream for ASGI servers.
+
+    Each chunk is produced on the request's thread-sensitive executor thread,
+    the thread the view ran on, so the database cursor never changes threads.
+    """
+    next_chunk = sync_to_async(next)
+    try:
+        while True:
+            chunk = await next_chunk(stream, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        if hasattr(stream, 'close'):
+            await sync_to_async(stream.close)()
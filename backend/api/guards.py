@@ -0,0 +1,384 @@
+"""
+Defensive checks against pathological uploads.
+
+``probe_image`` walks only the container headers of a JPEG, PNG or WebP
+file (segment/chunk lengths, frame dimensions and the EXIF IFD structure)
+without decoding anything, so crafted files with huge declared dimensions,
+thousands of IFD entries or giant metadata blocks can be rejected before
+exifread or Pillow touch them. ``cpu_time_limit`` bounds the CPU time spent
+on extraction itself.
+"""
+import signal
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+JPEG_SIGNATURE = b'\xff\xd8'
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# SOFn markers carry the frame dimensions; C4 (DHT), C8 (JPG) and CC (DAC)
+# share the range but are not frame headers
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+JPEG_STANDALONE_MARKERS = {0x01} | set(range(0xD0, 0xD8))
+JPEG_SOS = 0xDA
+JPEG_EOI = 0xD9
+JPEG_APP1 = 0xE1
+JPEG_COM = 0xFE
+
+PNG_METADATA_CHUNKS = {b'tEXt', b'zTXt', b'iTXt', b'eXIf', b'iCCP'}
+WEBP_METADATA_CHUNKS = {b'EXIF', b'XMP ', b'ICCP'}
+
+EXIF_HEADER = b'Exif\x00\x00'
+
+# TIFF field type sizes in bytes, keyed by type id
+TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8}
+# Tags whose value is the offset of a nested IFD (Exif, GPS, Interoperability)
+TIFF_SUB_IFD_TAGS = {0x8769, 0x8825, 0xA005}
+MAX_IFDS = 32
+
+# Structural limits on the header walk itself, so crafted files made of
+# thousands of empty segments or chunks cannot make probing expensive. Real
+# JPEGs have a few dozen segments before the scan; PNGs may split IDAT into
+# many chunks and animated WebPs carry one chunk per frame.
+JPEG_MAX_SEGMENTS = 256
+MAX_CHUNKS = 4096
+# Fill bytes before a JPEG marker are skipped in blocks of this size
+JPEG_FILL_BLOCK_SIZE = 4096
+
+
+class ImageProbeError(ValueError):
+    """
+    Raised when an image header is malformed or exceeds a budget.
+    """
+
+
+class ExtractionTimeout(BaseException):
+    """
+    Raised when extraction exceeds its CPU-time budget.
+
+    Like KeyboardInterrupt, it derives from BaseException so the broad
+    ``except Exception`` handlers inside extraction cannot swallow it.
+    """
+
+
+def probe_image(file, max_pixels: int, max_ifd_entries: int,
+                max_metadata_bytes: int) -> Dict[str, Any]:
+    """
+    Inspect image headers and enforce structural budgets.
+
+    Args:
+        file: Seekable binary file object positioned anywhere
+        max_pixels: Maximum declared width * height
+        max_ifd_entries: Maximum number of EXIF IFD entries across all IFDs
+        max_metadata_bytes: Maximum total size of metadata segments/chunks
+
+    Returns:
+        Dictionary with format, width, height, ifd_entries and metadata_bytes
+
+    Raises:
+        ImageProbeError: If the headers are malformed or over budget
+    """
+    budgets = {
+        'max_ifd_entries': max_ifd_entries,
+        'max_metadata_bytes': max_metadata_bytes,
+    }
+
+    file.seek(0)
+    header = file.read(12)
+    file.seek(0)
+
+    try:
+        if header.startswith(JPEG_SIGNATURE):
+            info = _probe_jpeg(file, budgets)
+        elif header.startswith(PNG_SIGNATURE):
+            info = _probe_png(file, budgets)
+        elif header.startswith(b'RIFF') and header[8:12] == b'WEBP':
+            info = _probe_webp(file, budgets)
+        else:
+            raise ImageProbeError('Unrecognised image format')
+    except struct.error:
+        raise ImageProbeError('Truncated image header')
+    finally:
+        file.seek(0)
+
+    if info['width'] is None or info['height'] is None:
+        raise ImageProbeError('Image dimensions not found in header')
+
+    if info['width'] * info['height'] > max_pixels:
+        raise ImageProbeError(
+            f"Image dimensions {info['width']}x{info['height']} exceed the "
+            f"{max_pixels} pixel limit"
+        )
+
+    return info
+
+
+def _new_info(image_format: str) -> Dict[str, Any]:
+    return {
+        'format': image_format,
+        'width': None,
+        'height': None,
+        'ifd_entries': 0,
+        'metadata_bytes': 0,
+    }
+
+
+def _read_exact(file, size: int) -> bytes:
+    data = file.read(size)
+    if len(data) != size:
+        raise ImageProbeError('Truncated image header')
+    return data
+
+
+def _add_metadata(info: Dict[str, Any], size: int, budgets: Dict[str, int]) -> None:
+    info['metadata_bytes'] += size
+    if info['metadata_bytes'] > budgets['max_metadata_bytes']:
+        raise ImageProbeError(
+            f"Image metadata exceeds the {budgets['max_metadata_bytes']} byte limit"
+        )
+
+
+def _check_chunk_count(count: int, limit: int) -> None:
+    if count > limit:
+        raise ImageProbeError(f'Image has more than {limit} header segments or chunks')
+
+
+def _read_jpeg_marker(file) -> int:
+    if _read_exact(file, 1) != b'\xff':
+        raise ImageProbeError('Invalid JPEG marker')
+
+    # Markers may be preceded by any number of 0xFF fill bytes
+    while True:
+        block = file.read(JPEG_FILL_BLOCK_SIZE)
+        if not block:
+            raise ImageProbeError('Truncated image header')
+        remainder = block.lstrip(b'\xff')
+        if remainder:
+            # Leave the file positioned just after the marker byte
+            file.seek(1 - len(remainder), 1)
+            return remainder[0]
+
+
+def _probe_jpeg(file, budgets: Dict[str, int]) -> Dict[str, Any]:
+    info = _new_info('JPEG')
+    file.seek(2)
+
+    segments = 0
+    while True:
+        marker = _read_jpeg_marker(file)
+        segments += 1
+        _check_chunk_count(segments, JPEG_MAX_SEGMENTS)
+
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        if marker in (JPEG_SOS, JPEG_EOI):
+            break
+
+        length = struct.unpack('>H', _read_exact(file, 2))[0]
+        if length < 2:
+            raise ImageProbeError('Invalid JPEG segment length')
+        payload_size = length - 2
+
+        if 0xE0 <= marker <= 0xEF or marker == JPEG_COM:
+            _add_metadata(info, payload_size, budgets)
+            if marker == JPEG_APP1:
+                payload = _read_exact(file, payload_size)
+                if payload.startswith(EXIF_HEADER):
+                    info['ifd_entries'] += _inspect_tiff(
+                        payload[len(EXIF_HEADER):],
+                        budgets['max_ifd_entries'] - info['ifd_entries']
+                    )
+                continue
+        elif marker in JPEG_SOF_MARKERS:
+            payload = _read_exact(file, payload_size)
+            height, width = struct.unpack('>HH', payload[1:5])
+            info['width'], info['height'] = width, height
+            continue
+
+        file.seek(payload_size, 1)
+
+    return info
+
+
+def _probe_png(file, budgets: Dict[str, int]) -> Dict[str, Any]:
+    info = _new_info('PNG')
+    file.seek(len(PNG_SIGNATURE))
+
+    length, chunk_type = struct.unpack('>I4s', _read_exact(file, 8))
+    if chunk_type != b'IHDR' or length < 8:
+        raise ImageProbeError('PNG is missing its IHDR header')
+    info['width'], info['height'] = struct.unpack('>II', _read_exact(file, 8))
+    file.seek(length - 8 + 4, 1)
+
+    # Text chunks may also follow the image data, so walk up to IEND
+    chunks = 1
+    while True:
+        chunk_header = file.read(8)
+        if len(chunk_header) < 8:
+            break
+        chunks += 1
+        _check_chunk_count(chunks, MAX_CHUNKS)
+        length, chunk_type = struct.unpack('>I4s', chunk_header)
+        if length > 0x7FFFFFFF:
+            raise ImageProbeError('Invalid PNG chunk length')
+        if chunk_type == b'IEND':
+            break
+
+        if chunk_type in PNG_METADATA_CHUNKS:
+            _add_metadata(info, length, budgets)
+            if chunk_type == b'eXIf':
+                info['ifd_entries'] += _inspect_tiff(
+                    _read_exact(file, length),
+                    budgets['max_ifd_entries'] - info['ifd_entries']
+                )
+                file.seek(4, 1)
+                continue
+
+        file.seek(length + 4, 1)
+
+    return info
+
+
+def _probe_webp(file, budgets: Dict[str, int]) -> Dict[str, Any]:
+    info = _new_info('WEBP')
+    file.seek(12)
+
+    chunks = 0
+    while True:
+        chunk_header = file.read(8)
+        if len(chunk_header) < 8:
+            break
+        chunks += 1
+        _check_chunk_count(chunks, MAX_CHUNKS)
+        chunk_type, length = struct.unpack('<4sI', chunk_header)
+        padded_length = length + (length & 1)
+
+        if chunk_type == b'VP8X':
+            data = _read_exact(file, 10)
+            info['width'] = int.from_bytes(data[4:7], 'little') + 1
+            info['height'] = int.from_bytes(data[7:10], 'little') + 1
+            file.seek(padded_length - 10, 1)
+        elif chunk_type == b'VP8 ' and info['width'] is None:
+            data = _read_exact(file, 10)
+            if data[3:6] != b'\x9d\x01\x2a':
+                raise ImageProbeError('Invalid WebP VP8 frame header')
+            width, height = struct.unpack('<HH', data[6:10])
+            info['width'], info['height'] = width & 0x3FFF, height & 0x3FFF
+            file.seek(padded_length - 10, 1)
+        elif chunk_type == b'VP8L' and info['width'] is None:
+            data = _read_exact(file, 5)
+            if data[0] != 0x2F:
+                raise ImageProbeError('Invalid WebP VP8L header')
+            bits = int.from_bytes(data[1:5], 'little')
+            info['width'] = (bits & 0x3FFF) + 1
+            info['height'] = ((bits >> 14) & 0x3FFF) + 1
+            file.seek(padded_length - 5, 1)
+        elif chunk_type in WEBP_METADATA_CHUNKS:
+            _add_metadata(info, length, budgets)
+            if chunk_type == b'EXIF':
+                data = _read_exact(file, length)
+                if data.startswith(EXIF_HEADER):
+                    data = data[len(EXIF_HEADER):]
+                info['ifd_entries'] += _inspect_tiff(
+                    data, budgets['max_ifd_entries'] - info['ifd_entries']
+                )
+                file.seek(padded_length - length, 1)
+            else:
+                file.seek(padded_length, 1)
+        else:
+            file.seek(padded_length, 1)
+
+    return info
+
+
+def _inspect_tiff(data: bytes, max_entries: int) -> int:
+    """
+    Walk the IFD chain of a TIFF/EXIF block without decoding any values.
+
+    Args:
+        data: TIFF block starting at its byte-order mark
+        max_entries: Entries still allowed under the budget
+
+    Returns:
+        Number of IFD entries found
+
+    Raises:
+        ImageProbeError: If the structure is malformed or over budget
+    """
+    if data[:2] == b'II':
+        endian = '<'
+    elif data[:2] == b'MM':
+        endian = '>'
+    else:
+        raise ImageProbeError('Invalid EXIF byte order')
+
+    if len(data) < 8 or struct.unpack(endian + 'H', data[2:4])[0] != 42:
+        raise ImageProbeError('Invalid EXIF header')
+
+    pending = [struct.unpack(endian + 'I', data[4:8])[0]]
+    visited = set()
+    total_entries = 0
+
+    while pending:
+        offset = pending.pop()
+        if offset == 0 or offset in visited:
+            continue
+        visited.add(offset)
+        if len(visited) > MAX_IFDS:
+            raise ImageProbeError('Too many EXIF IFDs')
+
+        if offset + 2 > len(data):
+            raise ImageProbeError('EXIF IFD offset out of bounds')
+        count = struct.unpack(endian + 'H', data[offset:offset + 2])[0]
+
+        total_entries += count
+        if total_entries > max_entries:
+            raise ImageProbeError('Too many EXIF IFD entries')
+
+        entries_end = offset + 2 + count * 12
+        if entries_end + 4 > len(data):
+            raise ImageProbeError('EXIF IFD extends past the end of the metadata')
+
+        for entry_offset in range(offset + 2, entries_end, 12):
+            tag, field_type, value_count, value = struct.unpack(
+                endian + 'HHII', data[entry_offset:entry_offset + 12]
+            )
+            # A value larger than the whole block is a crafted count that
+            # would make parsers loop over data that is not there
+            value_size = TIFF_TYPE_SIZES.get(field_type, 0) * value_count
+            if value_size > len(data):
+                raise ImageProbeError('EXIF value is larger than the metadata block')
+            if tag in TIFF_SUB_IFD_TAGS:
+                pending.append(value)
+
+        pending.append(struct.unpack(endian + 'I', data[entries_end:entries_end + 4])[0])
+
+    return total_entries
+
+
+@contextmanager
+def cpu_time_limit(seconds: Optional[float]):
+    """
+    Raise ExtractionTimeout if the enclosed block uses more than ``seconds``
+    of CPU time.
+
+    Uses ITIMER_VIRTUAL, which can only be armed from the main thread. Under
+    threaded or async workers the block runs unguarded and the header probe
+    is the only protection.
+    """
+    if (not seconds or not hasattr(signal, 'setitimer')
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+
+    def handle_timeout(signum, frame):
+        raise ExtractionTimeout(f'Extraction exceeded the {seconds} second CPU-time limit')
+
+    previous_handler = signal.signal(signal.SIGVTALRM, handle_timeout)
+    signal.setitimer(signal.ITIMER_VIRTUAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_VIRTUAL, 0)
+        signal.signal(signal.SIGVTALRM, previous_handler)
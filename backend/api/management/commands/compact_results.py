@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+
+from api.compact import compact_fields
+from api.models import UploadResult
+
+COMPACT_FIELD_NAMES = list(compact_fields('EXIF', 0.0, 0.0, None))
+
+
+class Command(BaseCommand):
+    help = 'Convert legacy result rows to the compact storage representation'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows converted per transaction (default: 1000)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the rows that would be converted without saving'
+        )
+
+    def handle(self, *args, **options):
+        legacy = UploadResult.objects.filter(kind=None).exclude(result_type=None)
+
+        if options['dry_run']:
+            self.stdout.write(
+                self.style.SUCCESS(f'Would convert {legacy.count()} results')
+            )
+            return
+
+        # Walk by primary key so each batch is a cheap index range scan and
+        # the command can be interrupted and resumed
+        converted = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                legacy.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .only('pk', 'result_type', 'latitude', 'longitude', 'exif_data')
+                [:options['batch_size']]
+            )
+            if not batch:
+                break
+
+            for upload_result in batch:
+                fields = compact_fields(
+                    upload_result.result_type,
+                    upload_result.latitude,
+                    upload_result.longitude,
+                    upload_result.exif_data
+                )
+                for field, value in fields.items():
+                    setattr(upload_result, field, value)
+
+            UploadResult.objects.bulk_update(batch, COMPACT_FIELD_NAMES)
+            converted += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f'Converted {converted} results')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Converted {converted} results to compact storage')
+        )
@@ -0,0 +1,77 @@
+import io
+import pstats
+import shutil
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.profiling import get_profile_path, list_profiles
+
+
+class Command(BaseCommand):
+    help = 'List and fetch per-request profiles captured by the upload endpoint'
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest='action', required=True)
+
+        subparsers.add_parser('list', help='List stored profiles, newest first')
+
+        fetch = subparsers.add_parser('fetch', help='Print or copy a stored profile')
+        fetch.add_argument(
+            'profile_id',
+            type=str,
+            help='Profile id or unique prefix (see "profiles list")'
+        )
+        fetch.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='Copy the raw pstats file to this path instead of printing a summary'
+        )
+        fetch.add_argument(
+            '--sort',
+            type=str,
+            default='cumulative',
+            help='pstats sort key for the printed summary (default: cumulative)'
+        )
+        fetch.add_argument(
+            '--limit',
+            type=int,
+            default=30,
+            help='Number of functions to print (default: 30)'
+        )
+
+    def handle(self, *args, **options):
+        if options['action'] == 'list':
+            self.list_profiles()
+        else:
+            self.fetch_profile(options)
+
+    def list_profiles(self):
+        profiles = list_profiles()
+        if not profiles:
+            self.stdout.write(self.style.WARNING('No profiles stored'))
+            return
+
+        for entry in profiles:
+            created = datetime.fromtimestamp(entry['created'], tz=timezone.utc)
+            self.stdout.write(
+                f"{entry['id']}  {created.isoformat(timespec='seconds')}  {entry['size']} bytes"
+            )
+
+    def fetch_profile(self, options):
+        path = get_profile_path(options['profile_id'])
+        if path is None:
+            raise CommandError(f'No unique profile matches "{options["profile_id"]}"')
+
+        if options['output']:
+            shutil.copyfile(path, options['output'])
+            self.stdout.write(
+                self.style.SUCCESS(f'Profile written to {options["output"]}')
+            )
+            return
+
+        buffer = io.StringIO()
+        stats = pstats.Stats(path, stream=buffer)
+        stats.sort_stats(options['sort']).print_stats(options['limit'])
+        self.stdout.write(buffer.getvalue())
@@ -0,0 +1,75 @@
+import os
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from api.compact import RESULT_KINDS
+from api.models import UploadResult
+from api.storage import original_path
+from api.utils import process_image, result_model_fields
+
+
+class Command(BaseCommand):
+    help = 'Re-run location extraction on results from their retained originals'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            type=str,
+            default=None,
+            choices=['EXIF', 'ESTIMATE'],
+            help='Only reprocess results of this type (e.g. ESTIMATE after an estimator upgrade)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows fetched per database round trip (default: 500)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would change without saving'
+        )
+
+    def handle(self, *args, **options):
+        queryset = UploadResult.objects.exclude(original_sha256=None)
+        if options['type']:
+            queryset = queryset.filter(
+                Q(result_type=options['type']) | Q(kind=RESULT_KINDS[options['type']])
+            )
+
+        # Rows sharing an original are adjacent, so each file is processed once
+        queryset = queryset.order_by('original_sha256', 'id')
+
+        updated = missing = 0
+        last_digest = last_fields = None
+
+        for upload_result in queryset.iterator(chunk_size=options['batch_size']):
+            digest = upload_result.original_sha256
+
+            if digest != last_digest:
+                path = original_path(digest)
+                if os.path.exists(path):
+                    last_fields = result_model_fields(process_image(path))
+                else:
+                    last_fields = None
+                    self.stdout.write(
+                        self.style.WARNING(f'Original {digest} is missing from the store')
+                    )
+                last_digest = digest
+
+            if last_fields is None:
+                missing += 1
+                continue
+
+            for field, value in last_fields.items():
+                setattr(upload_result, field, value)
+            if not options['dry_run']:
+                upload_result.save(update_fields=list(last_fields))
+            updated += 1
+
+        verb = 'Would update' if options['dry_run'] else 'Updated'
+        self.stdout.write(
+            self.style.SUCCESS(f'{verb} {updated} results ({missing} with missing originals)')
+        )
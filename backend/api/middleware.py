@@ -0,0 +1,71 @@
+"""
+Response compression middleware.
+
+Compresses response bodies above ``RESPONSE_COMPRESSION_MIN_SIZE`` with
+brotli (when the ``brotli`` package is installed and the client accepts it)
+or gzip. Streaming responses are left alone; the export endpoint compresses
+its own stream.
+
+Only paths under ``RESPONSE_COMPRESSION_PATHS`` are compressed. Those are
+token-authenticated API responses that carry no CSRF token or session
+secret next to attacker-controlled input. Pages that do, such as the admin
+and its login form, are never compressed, which keeps BREACH off them. Gzip
+bodies also get the same random header padding as Django's GZipMiddleware.
+The brotli binding offers no padding, so the path restriction is the only
+mitigation for brotli.
+"""
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+from .conditional import accepted_codings, with_encoding_suffix
+
+
+def _brotli_compress(content: bytes):
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli.compress(content, quality=settings.BROTLI_QUALITY)
+
+
+class CompressionMiddleware:
+    """
+    Compress eligible responses with brotli or gzip.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (not request.path.startswith(tuple(settings.RESPONSE_COMPRESSION_PATHS))
+                or response.streaming
+                or response.has_header('Content-Encoding')
+                or len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        accepted = accepted_codings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        compressed = coding = None
+        if 'br' in accepted:
+            compressed, coding = _brotli_compress(response.content), 'br'
+        if compressed is None and 'gzip' in accepted:
+            compressed = compress_string(
+                response.content, max_random_bytes=GZipMiddleware.max_random_bytes
+            )
+            coding = 'gzip'
+
+        # Don't compress if the result isn't smaller
+        if compressed is None or len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = coding
+        if response.has_header('ETag'):
+            response['ETag'] = with_encoding_suffix(response['ETag'], coding)
+        return response
@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-19 01:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('file_name', models.CharField(max_length=255)),
+                ('file_size', models.IntegerField()),
+                ('result_type', models.CharField(choices=[('EXIF', 'EXIF GPS Data'), ('ESTIMATE', 'ML Estimate')], max_length=20)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('accuracy', models.FloatField(blank=True, null=True)),
+                ('confidence', models.FloatField(blank=True, null=True)),
+                ('exif_data', models.JSONField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
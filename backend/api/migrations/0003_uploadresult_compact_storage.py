@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_uploadresult_original_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadresult',
+            name='exif_blob',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='uploadresult',
+            name='kind',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(1, 'EXIF GPS Data'), (2, 'ML Estimate')], null=True),
+        ),
+        migrations.AddField(
+            model_name='uploadresult',
+            name='lat_e6',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='uploadresult',
+            name='lng_e6',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='uploadresult',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='uploadresult',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='uploadresult',
+            name='result_type',
+            field=models.CharField(blank=True, choices=[('EXIF', 'EXIF GPS Data'), ('ESTIMATE', 'ML Estimate')], max_length=20, null=True),
+        ),
+    ]
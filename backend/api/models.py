@@ -1,4 +1,7 @@
 from django.db import models
+from django.utils.functional import cached_property
+
+from .compact import KIND_NAMES, RESULT_KINDS, decode_coordinate, decode_exif
 
 
 class UploadResult(models.Model):
@@ -7,21 +10,57 @@ class UploadResult(models.Model):
     This is optional - you can use this to persist results
     or keep them ephemeral as specified in requirements.
     """
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     file_name = models.CharField(max_length=255)
     file_size = models.IntegerField()
-    result_type = models.CharField(max_length=20, choices=[
+    result_type = models.CharField(max_length=20, null=True, blank=True, choices=[
         ('EXIF', 'EXIF GPS Data'),
         ('ESTIMATE', 'ML Estimate'),
     ])
-    latitude = models.FloatField()
-    longitude = models.FloatField()
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
     accuracy = models.FloatField(null=True, blank=True)
     confidence = models.FloatField(null=True, blank=True)
     exif_data = models.JSONField(null=True, blank=True)
     
+    # Compact representation (see api/compact.py). Rows use either these
+    # columns or the legacy ones above; read through the properties below.
+    kind = models.PositiveSmallIntegerField(null=True, blank=True, choices=[
+        (RESULT_KINDS['EXIF'], 'EXIF GPS Data'),
+        (RESULT_KINDS['ESTIMATE'], 'ML Estimate'),
+    ])
+    lat_e6 = models.IntegerField(null=True, blank=True)
+    lng_e6 = models.IntegerField(null=True, blank=True)
+    exif_blob = models.BinaryField(null=True, blank=True)
+    
+    # SHA-256 of the retained original (see api/storage.py), if any
+    original_sha256 = models.CharField(max_length=64, null=True, blank=True, db_index=True)
+    
     class Meta:
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"{self.file_name} - {self.result_type} ({self.latitude}, {self.longitude})"
+        return f"{self.file_name} - {self.location_type} ({self.lat}, {self.lng})"
+    
+    @property
+    def is_compact(self) -> bool:
+        return self.kind is not None
+    
+    @property
+    def location_type(self):
+        return KIND_NAMES[self.kind] if self.is_compact else self.result_type
+    
+    @property
+    def lat(self):
+        return decode_coordinate(self.lat_e6) if self.is_compact else self.latitude
+    
+    @property
+    def lng(self):
+        return decode_coordinate(self.lng_e6) if self.is_compact else self.longitude
+    
+    @cached_property
+    def exif(self):
+        """
+        EXIF payload, decoded from the compact blob on first access.
+        """
+        return decode_exif(self.exif_blob) if self.is_compact else self.exif_data
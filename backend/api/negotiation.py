@@ -0,0 +1,20 @@
+"""
+Content negotiation for the API.
+"""
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+class FormatOverrideNegotiation(DefaultContentNegotiation):
+    """
+    Let an explicit ``?format=`` win over the Accept header.
+
+    DRF's default negotiation narrows the renderers to the requested format
+    and then still matches them against Accept. Many HTTP clients send
+    ``Accept: application/json`` by default, so ``?format=csv`` would get
+    406. Here the Accept header is ignored when a format is given.
+    """
+
+    def get_accept_list(self, request):
+        if request.query_params.get(self.settings.URL_FORMAT_OVERRIDE):
+            return ['*/*']
+        return super().get_accept_list(request)
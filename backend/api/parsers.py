@@ -0,0 +1,35 @@
+"""
+Request body parsers for the binary formats in api/renderers.py.
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parse MessagePack request bodies.
+    """
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        import msgpack
+
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as e:
+            raise ParseError(f'MessagePack parse error - {e}')
+
+
+class CBORParser(BaseParser):
+    """
+    Parse CBOR request bodies.
+    """
+    media_type = 'application/cbor'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        import cbor2
+
+        try:
+            return cbor2.loads(stream.read())
+        except (ValueError, cbor2.CBORDecodeError) as e:
+            raise ParseError(f'CBOR parse error - {e}')
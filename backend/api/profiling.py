@@ -0,0 +1,147 @@
+"""
+On-demand profiling for individual API requests.
+
+Staff users can ask for a single request to be profiled by sending the
+``X-GeoLens-Profile: 1`` header or the ``?profile=1`` query flag. The
+request is then run under cProfile and the resulting pstats dump is written
+to a bounded ring of files in ``PROFILE_DIR``. Requests without the flag
+go straight through to the view.
+"""
+import cProfile
+import functools
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+PROFILE_HEADER = 'HTTP_X_GEOLENS_PROFILE'
+PROFILE_QUERY_PARAM = 'profile'
+PROFILE_SUFFIX = '.pstats'
+
+
+def get_profile_dir() -> str:
+    """
+    Return the directory profiles are written to.
+    """
+    return str(settings.PROFILE_DIR)
+
+
+def profiling_requested(request) -> bool:
+    """
+    Check whether a request asks to be profiled and is allowed to.
+
+    Args:
+        request: DRF Request object
+
+    Returns:
+        True if the flag is present and the user is staff
+    """
+    flag = request.META.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY_PARAM)
+    if not flag or flag.lower() in ('0', 'false', 'no'):
+        return False
+
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and user.is_staff)
+
+
+def save_profile(profiler: cProfile.Profile, label: str) -> str:
+    """
+    Dump a profiler to the ring directory and evict the oldest entries.
+
+    Args:
+        profiler: Finished cProfile.Profile instance
+        label: Short label describing the profiled request
+
+    Returns:
+        Identifier of the saved profile
+    """
+    profile_dir = get_profile_dir()
+    os.makedirs(profile_dir, exist_ok=True)
+
+    # Nanosecond timestamp prefix keeps the ring ordered by name
+    safe_label = ''.join(c if c.isalnum() else '-' for c in label).strip('-')[:40]
+    profile_id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}-{safe_label}"
+    final_path = os.path.join(profile_dir, profile_id + PROFILE_SUFFIX)
+    temp_path = final_path + '.tmp'
+
+    profiler.dump_stats(temp_path)
+    os.replace(temp_path, final_path)
+
+    prune_profiles(settings.PROFILE_RING_SIZE)
+    return profile_id
+
+
+def prune_profiles(keep: int) -> None:
+    """
+    Remove the oldest profiles so that at most ``keep`` remain.
+    """
+    for entry in list_profiles()[keep:]:
+        try:
+            os.remove(entry['path'])
+        except OSError:
+            pass  # Already evicted by another worker
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """
+    List stored profiles, newest first.
+
+    Returns:
+        List of dictionaries with id, path, size and created timestamp
+    """
+    profile_dir = get_profile_dir()
+    if not os.path.isdir(profile_dir):
+        return []
+
+    profiles = []
+    for name in os.listdir(profile_dir):
+        if not name.endswith(PROFILE_SUFFIX):
+            continue
+        path = os.path.join(profile_dir, name)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            continue
+        profile_id = name[:-len(PROFILE_SUFFIX)]
+        profiles.append({
+            'id': profile_id,
+            'path': path,
+            'size': size,
+            'created': int(profile_id.split('-', 1)[0]) / 1e9,
+        })
+
+    profiles.sort(key=lambda entry: entry['id'], reverse=True)
+    return profiles
+
+
+def get_profile_path(profile_id: str) -> Optional[str]:
+    """
+    Resolve a profile id (or unique prefix) to its file path.
+    """
+    matches = [entry['path'] for entry in list_profiles() if entry['id'].startswith(profile_id)]
+    if len(matches) != 1:
+        return None
+    return matches[0]
+
+
+def profile_request(view_func):
+    """
+    Decorator that profiles a DRF view when the request asks for it.
+
+    Must be applied below ``@api_view`` so that authentication has already
+    happened and ``request.user`` is available.
+    """
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not profiling_requested(request):
+            return view_func(request, *args, **kwargs)
+
+        profiler = cProfile.Profile()
+        response = profiler.runcall(view_func, request, *args, **kwargs)
+        profile_id = save_profile(profiler, view_func.__name__)
+        response['X-GeoLens-Profile-Id'] = profile_id
+        return response
+
+    return wrapper
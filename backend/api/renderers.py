@@ -0,0 +1,102 @@
+"""
+API renderers.
+
+MessagePack and CBOR are compact binary alternatives to JSON for machine
+clients, selected with the Accept header or ``?format=msgpack|cbor``.
+
+The export view streams its own body, so the NDJSON, GeoJSON and CSV
+renderers only exist so that DRF content negotiation accepts
+``?format=ndjson|geojson|csv`` and can render error responses
+(authentication failures, bad filters) in the requested format.
+"""
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Values JSON cannot represent natively (datetimes, decimals, UUIDs) are
+# converted the same way for every format
+_encode_default = JSONEncoder().default
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Render data as MessagePack.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        import msgpack
+        return msgpack.packb(data, default=_encode_default, use_bin_type=True)
+
+
+class CBORRenderer(BaseRenderer):
+    """
+    Render data as CBOR (RFC 8949).
+    """
+    media_type = 'application/cbor'
+    format = 'cbor'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        import cbor2
+        return cbor2.dumps(
+            data,
+            default=lambda encoder, value: encoder.encode(_encode_default(value))
+        )
+
+
+class NDJSONRenderer(JSONRenderer):
+    """
+    Newline-delimited JSON. A single object renders as one line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+class GeoJSONRenderer(JSONRenderer):
+    """
+    GeoJSON documents are plain JSON with their own media type.
+    """
+    media_type = 'application/geo+json'
+    format = 'geojson'
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Render a dictionary (or list of dictionaries) as CSV with a header row.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        rows = data if isinstance(data, list) else [data]
+        if not rows:
+            return b''
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0].keys()), extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode(self.charset)
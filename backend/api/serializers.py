@@ -18,7 +18,21 @@ class LocationResultSerializer(serializers.Serializer):
 class UploadResultSerializer(serializers.ModelSerializer):
     """
     Serializer for persisted upload results.
+    
+    Reads through the model properties so legacy and compact rows serialize
+    the same way. ``exif_data`` is only included (and the compact blob only
+    decoded) when the context sets ``include_exif``.
     """
+    result_type = serializers.CharField(source='location_type', read_only=True)
+    latitude = serializers.FloatField(source='lat', read_only=True)
+    longitude = serializers.FloatField(source='lng', read_only=True)
+    exif_data = serializers.DictField(source='exif', read_only=True, allow_null=True)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.context.get('include_exif'):
+            self.fields.pop('exif_data')
+    
     class Meta:
         model = UploadResult
         fields = [
@@ -0,0 +1,80 @@
+"""
+Content-addressed store for original uploaded images.
+
+When ``RETAIN_ORIGINALS`` is enabled, every upload is kept under a path
+derived from the SHA-256 of its content, sharded into nested directories
+(``ab/cd/abcd...``) so no single directory grows too large. Identical uploads
+map to the same file and are written only once. Files are staged inside the
+store and moved into place with an atomic rename once the upload's result
+row exists, so a reader never sees a partially written original and failed
+uploads leave no unreferenced files.
+"""
+import os
+import tempfile
+
+from django.conf import settings
+
+# Number of nested directory levels and hex characters per level
+SHARD_DEPTH = 2
+SHARD_WIDTH = 2
+
+STAGING_DIR_NAME = 'tmp'
+
+
+def get_originals_root() -> str:
+    """
+    Return the root directory of the original-image store.
+    """
+    return str(settings.ORIGINALS_ROOT)
+
+
+def original_path(digest: str) -> str:
+    """
+    Return the store path for a SHA-256 hex digest.
+
+    Args:
+        digest: Lowercase hex SHA-256 of the file content
+
+    Returns:
+        Absolute path of the stored original
+    """
+    shards = [
+        digest[level * SHARD_WIDTH:(level + 1) * SHARD_WIDTH]
+        for level in range(SHARD_DEPTH)
+    ]
+    return os.path.join(get_originals_root(), *shards, digest)
+
+
+def create_staging_dir() -> str:
+    """
+    Create a temporary directory on the same filesystem as the store, so
+    staged files can be renamed into place atomically.
+    """
+    staging_root = os.path.join(get_originals_root(), STAGING_DIR_NAME)
+    os.makedirs(staging_root, exist_ok=True)
+    return tempfile.mkdtemp(dir=staging_root)
+
+
+def commit_original(staged_path: str, digest: str) -> str:
+    """
+    Move a staged file into the store, or drop it if the content is already
+    stored.
+
+    Args:
+        staged_path: Path of the fully written file in a staging directory
+        digest: SHA-256 hex digest of its content
+
+    Returns:
+        Path of the stored original
+    """
+    final_path = original_path(digest)
+
+    if os.path.exists(final_path):
+        os.remove(staged_path)
+        return final_path
+
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    # A concurrent upload of the same content may win the race; both files
+    # are identical, so replacing is harmless
+    os.replace(staged_path, final_path)
+    return final_path
@@ -37,6 +37,22 @@ class ImageProcessingTests(TestCase):
         result = dms_to_decimal(None, 'N')
         self.assertIsNone(result)
     
+    def test_utils_import_is_lazy(self):
+        """Test that importing utils does not load the image libraries."""
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys, api.utils; "
+            "print(any(name in sys.modules for name in ('exifread', 'PIL')))"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), 'False')
+    
     def test_geolocate_image_stub(self):
         """Test the geolocation stub function."""
         # Create a dummy file path
@@ -157,3 +173,674 @@ class APITests(TestCase):
         response = self.client.get('/api/health/')
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['status'], 'healthy')
+
+
+class ProfilingTests(TestCase):
+    """Test on-demand request profiling."""
+    
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='staffuser',
+            password='testpass123',
+            is_staff=True
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+    
+    def test_profile_flag_writes_profile(self):
+        """Test that staff requests with the flag are profiled."""
+        from django.test import override_settings
+        from .profiling import list_profiles
+        
+        with override_settings(PROFILE_DIR=self.profile_dir):
+            response = self.client.post('/api/upload/', HTTP_X_GEOLENS_PROFILE='1')
+            profiles = list_profiles()
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(profiles), 1)
+        self.assertEqual(response['X-GeoLens-Profile-Id'], profiles[0]['id'])
+    
+    def test_profile_flag_ignored_for_non_staff(self):
+        """Test that non-staff users cannot trigger profiling."""
+        from django.test import override_settings
+        from .profiling import list_profiles
+        
+        self.user.is_staff = False
+        self.user.save()
+        
+        with override_settings(PROFILE_DIR=self.profile_dir):
+            response = self.client.post('/api/upload/?profile=1')
+            profiles = list_profiles()
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(profiles, [])
+        self.assertFalse(response.has_header('X-GeoLens-Profile-Id'))
+    
+    def test_profile_ring_is_bounded(self):
+        """Test that old profiles are evicted from the ring."""
+        from django.test import override_settings
+        from .profiling import list_profiles
+        
+        with override_settings(PROFILE_DIR=self.profile_dir, PROFILE_RING_SIZE=2):
+            for _ in range(4):
+                self.client.post('/api/upload/?profile=1')
+            profiles = list_profiles()
+        
+        self.assertEqual(len(profiles), 2)
+
+
+class ExportTests(TestCase):
+    """Test the streaming results export endpoint."""
+    
+    def setUp(self):
+        from .models import UploadResult
+        
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='analyst',
+            password='testpass123',
+            is_staff=True
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        
+        UploadResult.objects.create(
+            file_name='gps.jpg', file_size=1000, result_type='EXIF',
+            latitude=40.7083, longitude=-74.0060, accuracy=5,
+            exif_data={'GPS GPSLatitudeRef': 'N'}
+        )
+        UploadResult.objects.create(
+            file_name='plain.jpg', file_size=2000, result_type='ESTIMATE',
+            latitude=0.0, longitude=0.0, confidence=0.0
+        )
+    
+    def read_stream(self, response):
+        return b''.join(response.streaming_content)
+    
+    def test_export_requires_staff(self):
+        """Test that non-staff users cannot export results."""
+        self.user.is_staff = False
+        self.user.save()
+        
+        response = self.client.get('/api/results/export/')
+        self.assertEqual(response.status_code, 403)
+    
+    def test_export_ndjson(self):
+        """Test NDJSON export with a type filter."""
+        response = self.client.get('/api/results/export/?format=ndjson&type=exif&exif=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        
+        lines = self.read_stream(response).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(row['file_name'], 'gps.jpg')
+        self.assertEqual(row['exif_data'], {'GPS GPSLatitudeRef': 'N'})
+    
+    def test_export_geojson(self):
+        """Test GeoJSON export produces a FeatureCollection."""
+        response = self.client.get('/api/results/export/?format=geojson')
+        self.assertEqual(response.status_code, 200)
+        
+        collection = json.loads(self.read_stream(response))
+        self.assertEqual(collection['type'], 'FeatureCollection')
+        self.assertEqual(len(collection['features']), 2)
+        self.assertEqual(
+            collection['features'][0]['geometry']['coordinates'],
+            [-74.0060, 40.7083]
+        )
+        self.assertNotIn('exif_data', collection['features'][0]['properties'])
+    
+    def test_export_csv_gzip(self):
+        """Test gzip-compressed CSV export with a time range filter."""
+        import csv
+        import gzip
+        import io
+        
+        response = self.client.get(
+            '/api/results/export/?format=csv&since=2000-01-01T00:00:00',
+            HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        
+        body = gzip.decompress(self.read_stream(response)).decode()
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]['result_type'], 'ESTIMATE')
+    
+    def test_export_format_negotiation(self):
+        """Test the Accept header selects the format and unknown formats are 404."""
+        response = self.client.get('/api/results/export/', HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertTrue(self.read_stream(response).startswith(b'id,created_at,'))
+        
+        response = self.client.get('/api/results/export/?format=xml')
+        self.assertEqual(response.status_code, 404)
+        
+        # An explicit format wins over a client's default Accept header
+        response = self.client.get('/api/results/export/?format=csv', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+    
+    def test_export_refused_gzip(self):
+        """Test that gzip listed with q=0 is not applied."""
+        response = self.client.get(
+            '/api/results/export/', HTTP_ACCEPT_ENCODING='gzip;q=0, identity'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(len(self.read_stream(response).splitlines()), 2)
+    
+    async def test_export_streams_under_asgi(self):
+        """Test that ASGI requests get an async stream instead of a buffered one."""
+        from django.test import AsyncClient
+        
+        response = await AsyncClient().get(
+            '/api/results/export/',
+            headers={'Authorization': f'Token {self.token.key}'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.splitlines()), 2)
+    
+    def test_export_invalid_filter(self):
+        """Test export with an invalid time filter."""
+        response = self.client.get('/api/results/export/?format=csv&until=yesterday')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('until', response.content.decode())
+
+
+def create_gps_image(image_path):
+    """Create a JPEG tagged with GPS EXIF coordinates (40°42'30"N, 74°0'21.6"W)."""
+    image = Image.new('RGB', (100, 100), color='blue')
+    exif = Image.Exif()
+    exif[0x8825] = {
+        1: 'N', 2: (40.0, 42.0, 30.0),
+        3: 'W', 4: (74.0, 0.0, 21.6),
+    }
+    image.save(image_path, 'JPEG', exif=exif)
+
+
+class OriginalStoreTests(TestCase):
+    """Test the content-addressed original-image store."""
+    
+    def setUp(self):
+        from django.test import override_settings
+        
+        self.store_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            RETAIN_ORIGINALS=True,
+            ORIGINALS_ROOT=self.store_dir
+        )
+        self.settings_override.enable()
+        
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        
+        self.image_path = os.path.join(self.store_dir, 'upload.jpg')
+        create_gps_image(self.image_path)
+    
+    def tearDown(self):
+        import shutil
+        self.settings_override.disable()
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+    
+    def upload(self):
+        with open(self.image_path, 'rb') as f:
+            return self.client.post('/api/upload/', {'file': f})
+    
+    def test_duplicate_uploads_are_stored_once(self):
+        """Test that identical uploads share one sharded original."""
+        import hashlib
+        from .models import UploadResult
+        from .storage import original_path
+        
+        self.assertEqual(self.upload().status_code, 200)
+        self.assertEqual(self.upload().status_code, 200)
+        
+        with open(self.image_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        
+        stored = original_path(digest)
+        self.assertTrue(os.path.exists(stored))
+        self.assertEqual(
+            os.path.relpath(stored, self.store_dir),
+            os.path.join(digest[:2], digest[2:4], digest)
+        )
+        
+        results = UploadResult.objects.all()
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(r.original_sha256 == digest for r in results))
+        self.assertEqual(results[0].result_type, 'EXIF')
+        
+        # Only the stored original and the staging directory remain
+        stored_files = [
+            name for _, _, files in os.walk(self.store_dir) for name in files
+        ]
+        self.assertEqual(sorted(stored_files), sorted([digest, 'upload.jpg']))
+    
+    def test_failed_uploads_leave_no_original(self):
+        """Test that originals are only stored once a result row exists."""
+        from unittest import mock
+        from .guards import ExtractionTimeout
+        from .models import UploadResult
+        
+        failures = [
+            (ExtractionTimeout('Extraction exceeded the CPU-time limit'), 422),
+            (RuntimeError('decoder crashed'), 500),
+        ]
+        for error, status_code in failures:
+            with mock.patch('api.views.process_image', side_effect=error):
+                self.assertEqual(self.upload().status_code, status_code)
+        
+        self.assertFalse(UploadResult.objects.exists())
+        stored_files = [
+            name for _, _, files in os.walk(self.store_dir) for name in files
+        ]
+        self.assertEqual(stored_files, ['upload.jpg'])
+    
+    def test_reprocess_from_store(self):
+        """Test that results can be reprocessed from the stored original."""
+        from io import StringIO
+        from django.core.management import call_command
+        from .models import UploadResult
+        
+        self.assertEqual(self.upload().status_code, 200)
+        UploadResult.objects.update(latitude=0.0, longitude=0.0)
+        
+        out = StringIO()
+        call_command('reprocess_originals', stdout=out)
+        
+        self.assertIn('Updated 1 results', out.getvalue())
+        upload_result = UploadResult.objects.get()
+        self.assertAlmostEqual(upload_result.latitude, 40.7083, places=3)
+    
+    def test_reprocess_compact_rows(self):
+        """Test reprocessing compact rows by type back into legacy storage."""
+        from io import StringIO
+        from django.core.management import call_command
+        from django.test import override_settings
+        from .compact import KIND_ESTIMATE
+        from .models import UploadResult
+        
+        with override_settings(COMPACT_RESULT_STORAGE=True):
+            self.assertEqual(self.upload().status_code, 200)
+        UploadResult.objects.update(kind=KIND_ESTIMATE, lat_e6=0, lng_e6=0)
+        
+        out = StringIO()
+        with override_settings(COMPACT_RESULT_STORAGE=False):
+            call_command('reprocess_originals', '--type', 'ESTIMATE', stdout=out)
+        
+        self.assertIn('Updated 1 results', out.getvalue())
+        upload_result = UploadResult.objects.get()
+        self.assertFalse(upload_result.is_compact)
+        self.assertEqual(upload_result.location_type, 'EXIF')
+        self.assertAlmostEqual(upload_result.lat, 40.7083, places=3)
+        self.assertIsNotNone(upload_result.exif)
+
+
+class UploadGuardTests(TestCase):
+    """Test header-only probing and extraction CPU limits."""
+    
+    def probe(self, data, **budgets):
+        import io
+        from .guards import probe_image
+        
+        limits = {
+            'max_pixels': 50_000_000,
+            'max_ifd_entries': 1000,
+            'max_metadata_bytes': 512 * 1024,
+        }
+        limits.update(budgets)
+        return probe_image(io.BytesIO(data), **limits)
+    
+    def encode(self, image, image_format, **params):
+        import io
+        buffer = io.BytesIO()
+        image.save(buffer, image_format, **params)
+        return buffer.getvalue()
+    
+    def test_probe_reads_dimensions(self):
+        """Test that dimensions are read from JPEG, PNG and WebP headers."""
+        image = Image.new('RGB', (123, 45), color='red')
+        
+        for image_format in ('JPEG', 'PNG', 'WEBP'):
+            info = self.probe(self.encode(image, image_format))
+            self.assertEqual(info['format'], image_format)
+            self.assertEqual((info['width'], info['height']), (123, 45))
+        
+        lossless = self.probe(self.encode(image, 'WEBP', lossless=True))
+        self.assertEqual((lossless['width'], lossless['height']), (123, 45))
+    
+    def test_probe_rejects_huge_declared_dimensions(self):
+        """Test that a PNG declaring a huge canvas is rejected from its IHDR."""
+        import struct
+        import zlib
+        from .guards import ImageProbeError
+        
+        ihdr = struct.pack('>IIBBBBB', 100000, 100000, 8, 2, 0, 0, 0)
+        data = (
+            b'\x89PNG\r\n\x1a\n'
+            + struct.pack('>I', len(ihdr)) + b'IHDR' + ihdr
+            + struct.pack('>I', zlib.crc32(b'IHDR' + ihdr))
+        )
+        
+        with self.assertRaisesRegex(ImageProbeError, 'pixel limit'):
+            self.probe(data)
+    
+    def test_probe_rejects_ifd_and_metadata_budgets(self):
+        """Test that EXIF entry counts and metadata size are budgeted."""
+        from .guards import ImageProbeError
+        
+        exif = Image.Exif()
+        for tag in range(0x9000, 0x9000 + 50):
+            exif[tag] = 'x'
+        data = self.encode(Image.new('RGB', (10, 10)), 'JPEG', exif=exif)
+        
+        info = self.probe(data)
+        self.assertGreaterEqual(info['ifd_entries'], 50)
+        
+        with self.assertRaisesRegex(ImageProbeError, 'IFD entries'):
+            self.probe(data, max_ifd_entries=20)
+        with self.assertRaisesRegex(ImageProbeError, 'metadata exceeds'):
+            self.probe(data, max_metadata_bytes=100)
+    
+    def test_probe_rejects_segment_floods_quickly(self):
+        """Test that files made of empty segments or fill bytes are cheap to reject."""
+        import time
+        from .guards import ImageProbeError
+        
+        size = 10 * 1024 * 1024
+        floods = {
+            'COM segments': b'\xff\xd8' + b'\xff\xfe\x00\x02' * (size // 4),
+            'standalone markers': b'\xff\xd8' + b'\xff\xd0' * (size // 2),
+            'fill bytes': b'\xff\xd8\xff' + b'\xff' * size,
+        }
+        for label, data in floods.items():
+            with self.subTest(label):
+                start = time.process_time()
+                with self.assertRaises(ImageProbeError):
+                    self.probe(data)
+                self.assertLess(time.process_time() - start, 0.5)
+    
+    def test_upload_rejects_pathological_image(self):
+        """Test that the upload endpoint rejects files over budget."""
+        from django.test import override_settings
+        
+        client = APIClient()
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        
+        temp_dir = tempfile.mkdtemp()
+        image_path = os.path.join(temp_dir, 'large.png')
+        Image.new('RGB', (200, 200)).save(image_path, 'PNG')
+        
+        try:
+            with override_settings(IMAGE_MAX_PIXELS=100 * 100):
+                with open(image_path, 'rb') as f:
+                    response = client.post('/api/upload/', {'file': f})
+        finally:
+            import shutil
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('pixel limit', response.data['error'])
+    
+    def test_upload_accepts_webp(self):
+        """Test that WebP uploads pass the magic-byte check."""
+        client = APIClient()
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        
+        temp_dir = tempfile.mkdtemp()
+        image_path = os.path.join(temp_dir, 'photo.webp')
+        Image.new('RGB', (100, 100), color='green').save(image_path, 'WEBP')
+        
+        try:
+            with open(image_path, 'rb') as f:
+                response = client.post('/api/upload/', {'file': f})
+        finally:
+            import shutil
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['type'], 'ESTIMATE')
+    
+    def test_cpu_time_limit(self):
+        """Test that CPU-bound work is interrupted once over budget."""
+        from .guards import ExtractionTimeout, cpu_time_limit
+        
+        with self.assertRaises(ExtractionTimeout):
+            with cpu_time_limit(0.05):
+                try:
+                    while True:
+                        pass
+                except Exception:
+                    self.fail('ExtractionTimeout was caught by except Exception')
+        
+        # Work within the budget is unaffected
+        with cpu_time_limit(5):
+            sum(range(1000))
+
+
+class CompactStorageTests(TestCase):
+    """Test the compact result representation."""
+    
+    exif = {
+        'GPS GPSLatitudeRef': 'N',
+        'GPS GPSLatitude': '[40, 42, 30]',
+        'Custom Tag': 'value',
+    }
+    
+    def test_codec_round_trip(self):
+        """Test coordinate and EXIF encoding round trips."""
+        from .compact import decode_coordinate, decode_exif, encode_coordinate, encode_exif
+        
+        self.assertEqual(encode_coordinate(-74.006), -74006000)
+        self.assertAlmostEqual(decode_coordinate(encode_coordinate(40.7083333)), 40.708333, places=6)
+        
+        blob = encode_exif(self.exif)
+        self.assertEqual(decode_exif(blob), self.exif)
+        self.assertLess(len(blob), len(json.dumps(self.exif)))
+        self.assertIsNone(encode_exif({}))
+    
+    def test_compact_rows_read_like_legacy_rows(self):
+        """Test that model properties and the serializer hide the representation."""
+        from .compact import compact_fields
+        from .models import UploadResult
+        from .serializers import UploadResultSerializer
+        
+        legacy = UploadResult.objects.create(
+            file_name='a.jpg', file_size=1, result_type='EXIF',
+            latitude=40.7083, longitude=-74.006, exif_data=self.exif
+        )
+        compact = UploadResult.objects.create(
+            file_name='b.jpg', file_size=1,
+            **compact_fields('EXIF', 40.7083, -74.006, self.exif)
+        )
+        compact = UploadResult.objects.get(pk=compact.pk)
+        
+        self.assertIsNone(compact.latitude)
+        self.assertEqual(compact.location_type, 'EXIF')
+        self.assertAlmostEqual(compact.lat, legacy.lat, places=6)
+        self.assertAlmostEqual(compact.lng, legacy.lng, places=6)
+        self.assertEqual(compact.exif, legacy.exif)
+        
+        data = UploadResultSerializer(compact).data
+        self.assertNotIn('exif_data', data)
+        self.assertAlmostEqual(data['latitude'], 40.7083, places=6)
+        
+        data = UploadResultSerializer(compact, context={'include_exif': True}).data
+        self.assertEqual(data['exif_data'], self.exif)
+    
+    def test_compact_results_command(self):
+        """Test converting legacy rows and exporting them unchanged."""
+        from io import StringIO
+        from django.core.management import call_command
+        from .models import UploadResult
+        
+        for index in range(3):
+            UploadResult.objects.create(
+                file_name=f'{index}.jpg', file_size=1, result_type='ESTIMATE',
+                latitude=1.5, longitude=-2.25, confidence=0.5, exif_data=self.exif
+            )
+        
+        out = StringIO()
+        call_command('compact_results', '--batch-size', '2', stdout=out)
+        self.assertIn('Converted 3 results to compact storage', out.getvalue())
+        
+        self.assertFalse(UploadResult.objects.filter(kind=None).exists())
+        self.assertFalse(UploadResult.objects.exclude(latitude=None).exists())
+        
+        client = APIClient()
+        user = User.objects.create_user(username='analyst', password='testpass123', is_staff=True)
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        response = client.get('/api/results/export/?format=ndjson&type=ESTIMATE&exif=1')
+        
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['result_type'], 'ESTIMATE')
+        self.assertEqual((rows[0]['latitude'], rows[0]['longitude']), (1.5, -2.25))
+        self.assertEqual(rows[0]['exif_data'], self.exif)
+
+
+class ResponseFormatTests(TestCase):
+    """Test binary formats, compression and conditional responses."""
+    
+    def setUp(self):
+        from .models import UploadResult
+        
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='analyst',
+            password='testpass123',
+            is_staff=True
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        
+        self.exif = {f'Custom Tag {index}': 'value ' * 10 for index in range(40)}
+        self.result = UploadResult.objects.create(
+            file_name='gps.jpg', file_size=1000, result_type='EXIF',
+            latitude=40.7083, longitude=-74.0060, accuracy=5,
+            exif_data=self.exif
+        )
+        self.url = f'/api/results/{self.result.pk}/'
+    
+    def test_binary_formats(self):
+        """Test MessagePack and CBOR content negotiation."""
+        import cbor2
+        import msgpack
+        
+        json_response = self.client.get(self.url)
+        msgpack_response = self.client.get(self.url, HTTP_ACCEPT='application/msgpack')
+        cbor_response = self.client.get(self.url + '?format=cbor')
+        
+        self.assertEqual(msgpack_response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(msgpack_response.content), json_response.json())
+        self.assertEqual(cbor2.loads(cbor_response.content), json_response.json())
+        self.assertLess(len(msgpack_response.content), len(json_response.content))
+        
+        # Each representation has its own strong ETag
+        etags = {r['ETag'] for r in (json_response, msgpack_response, cbor_response)}
+        self.assertEqual(len(etags), 3)
+    
+    def test_binary_parsers(self):
+        """Test that MessagePack and CBOR request bodies can be parsed."""
+        import io
+        import cbor2
+        import msgpack
+        from rest_framework.exceptions import ParseError
+        from .parsers import CBORParser, MessagePackParser
+        
+        payload = {'lat': 1.5, 'tags': ['a', 'b']}
+        self.assertEqual(MessagePackParser().parse(io.BytesIO(msgpack.packb(payload))), payload)
+        self.assertEqual(CBORParser().parse(io.BytesIO(cbor2.dumps(payload))), payload)
+        
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(io.BytesIO(b'\xc1'))
+    
+    def test_repeat_fetch_not_modified(self):
+        """Test that a matching If-None-Match gets a 304."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('exif_data', response.json())
+        etag = response['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        
+        # A different representation does not match
+        response = self.client.get(self.url + '?exif=1', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        
+        # A changed result gets a new tag
+        self.result.accuracy = 10
+        self.result.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+    
+    def test_large_bodies_are_compressed(self):
+        """Test gzip/brotli compression and suffixed ETags."""
+        import gzip
+        import brotli
+        
+        plain = self.client.get(self.url + '?exif=1')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        
+        gzipped = self.client.get(self.url + '?exif=1', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(gzipped['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(gzipped.content), plain.content)
+        self.assertEqual(gzipped['ETag'], plain['ETag'][:-1] + '-gzip"')
+        
+        brotlied = self.client.get(self.url + '?exif=1', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(brotlied['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(brotlied.content), plain.content)
+        
+        # The compressed tag still validates the cached representation
+        response = self.client.get(
+            self.url + '?exif=1',
+            HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=gzipped['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], gzipped['ETag'])
+        
+        # Gzip bodies get random header padding (BREACH)
+        sizes = {
+            len(self.client.get(self.url + '?exif=1', HTTP_ACCEPT_ENCODING='gzip').content)
+            for _ in range(5)
+        }
+        self.assertGreater(len(sizes), 1)
+        
+        # Small bodies are left alone
+        small = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertLess(len(small.content), 1024)
+        self.assertFalse(small.has_header('Content-Encoding'))
+    
+    def test_pages_outside_api_results_are_not_compressed(self):
+        """Test that pages with CSRF tokens are never compressed."""
+        response = self.client.get('/admin/login/', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(len(response.content), 1024)
+        self.assertIn(b'csrfmiddlewaretoken', response.content)
+        self.assertFalse(response.has_header('Content-Encoding'))
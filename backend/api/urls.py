@@ -3,5 +3,7 @@ from . import views
 
 urlpatterns = [
     path('upload/', views.upload_image, name='upload_image'),
+    path('results/<int:pk>/', views.result_detail, name='result_detail'),
+    path('results/export/', views.export_results, name='export_results'),
     path('health/', views.health_check, name='health_check'),
 ]
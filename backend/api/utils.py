@@ -3,12 +3,15 @@ Utility functions for EXIF processing and geolocation.
 """
 import os
 import time
+import uuid
 from typing import Dict, Any, Optional, Tuple
-import exifread
-from PIL import Image
-from PIL.ExifTags import TAGS, GPSTAGS
-from exifread.utils import Ratio
+from django.conf import settings
+from .compact import compact_fields
+from .guards import ImageProbeError, probe_image
 
+# exifread and Pillow are imported inside the functions that use them so that
+# importing this module (management commands, URL loading) stays cheap. The
+# web server pulls them in once at startup via api.warmup.
 
 
 def extract_gps_from_exif(image_path: str) -> Optional[Dict[str, Any]]:
@@ -21,6 +24,8 @@ def extract_gps_from_exif(image_path: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary with GPS data or None if not found
     """
+    import exifread
+    
     try:
         # Try with exifread first
         with open(image_path, 'rb') as f:
@@ -178,6 +183,75 @@ def geolocate_image(file_path: str) -> Dict[str, Any]:
     }
 
 
+def process_image(image_path: str) -> Dict[str, Any]:
+    """
+    Locate an image from EXIF GPS data, falling back to estimation.
+    
+    Args:
+        image_path: Path to the image file
+        
+    Returns:
+        Dictionary in the LocationResultSerializer format
+    """
+    # Try to extract EXIF GPS data first
+    exif_result = extract_gps_from_exif(image_path)
+    
+    if exif_result:
+        return {
+            'type': 'EXIF',
+            'lat': exif_result['lat'],
+            'lng': exif_result['lng'],
+            'accuracy': exif_result['accuracy'],
+            'source': exif_result['source'],
+            'exif': exif_result['exif']
+        }
+    
+    # Fall back to ML estimation
+    estimate_result = geolocate_image(image_path)
+    return {
+        'type': 'ESTIMATE',
+        'lat': estimate_result['lat'],
+        'lng': estimate_result['lng'],
+        'confidence': estimate_result['confidence'],
+        'source': estimate_result['source']
+    }
+
+
+def result_model_fields(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map a process_image result onto UploadResult field values.
+    
+    Args:
+        result: Dictionary returned by process_image
+        
+    Returns:
+        Keyword arguments for UploadResult
+    """
+    exif = result.get('exif')
+    # Pillow returns rationals and bytes, which JSON cannot hold
+    exif = {str(k): str(v) for k, v in exif.items()} if exif else None
+    
+    fields = {
+        'accuracy': result.get('accuracy'),
+        'confidence': result.get('confidence'),
+    }
+    if settings.COMPACT_RESULT_STORAGE:
+        fields.update(compact_fields(result['type'], result['lat'], result['lng'], exif))
+    else:
+        fields.update({
+            'result_type': result['type'],
+            'latitude': result['lat'],
+            'longitude': result['lng'],
+            'exif_data': exif,
+            # Clear any compact columns so the legacy values are the ones read
+            'kind': None,
+            'lat_e6': None,
+            'lng_e6': None,
+            'exif_blob': None,
+        })
+    return fields
+
+
 def validate_image_file(file) -> Tuple[bool, str]:
     """
     Validate uploaded image file.
@@ -199,20 +273,34 @@ def validate_image_file(file) -> Tuple[bool, str]:
     
     # Check file header/magic bytes for security
     file.seek(0)
-    header = file.read(8)
+    header = file.read(12)
     file.seek(0)
     
     # JPEG magic bytes
     if header.startswith(b'\xff\xd8\xff'):
-        return True, ""
+        pass
     # PNG magic bytes
     elif header.startswith(b'\x89PNG\r\n\x1a\n'):
-        return True, ""
+        pass
     # WebP magic bytes
-    elif header.startswith(b'RIFF') and b'WEBP' in header:
-        return True, ""
+    elif header.startswith(b'RIFF') and header[8:12] == b'WEBP':
+        pass
+    else:
+        return False, "Invalid file format or corrupted file"
     
-    return False, "Invalid file format or corrupted file"
+    # Check header structure against decompression-bomb budgets before
+    # anything parses or decodes the file
+    try:
+        probe_image(
+            file,
+            max_pixels=settings.IMAGE_MAX_PIXELS,
+            max_ifd_entries=settings.IMAGE_MAX_IFD_ENTRIES,
+            max_metadata_bytes=settings.IMAGE_MAX_METADATA_BYTES
+        )
+    except ImageProbeError as e:
+        return False, f"Rejected image: {e}"
+    
+    return True, ""
 
 
 def get_safe_filename(filename: str) -> str:
@@ -225,9 +313,6 @@ def get_safe_filename(filename: str) -> str:
     Returns:
         Safe filename with timestamp
     """
-    import uuid
-    import os
-    
     # Get file extension
     _, ext = os.path.splitext(filename)
     
@@ -1,15 +1,31 @@
+import hashlib
 import os
 import tempfile
 from django.conf import settings
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from .serializers import LocationResultSerializer
+from .compact import RESULT_KINDS
+from .conditional import accepted_codings, content_etag, matching_etag
+from .export import EXPORT_CONTENT_TYPES, aiter_stream, stream_export
+from .guards import ExtractionTimeout, cpu_time_limit
+from .models import UploadResult
+from .profiling import profile_request
+from .renderers import CSVRenderer, GeoJSONRenderer, NDJSONRenderer
+from .serializers import LocationResultSerializer, UploadResultSerializer
+from .storage import commit_original, create_staging_dir
 from .utils import (
-    extract_gps_from_exif,
-    geolocate_image,
+    process_image,
+    result_model_fields,
     validate_image_file,
     get_safe_filename
 )
@@ -17,6 +33,7 @@ from .utils import (
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@profile_request
 def upload_image(request):
     """
     Upload and process image for location extraction.
@@ -24,6 +41,9 @@ def upload_image(request):
     Expected payload:
     - file: Image file (JPEG, PNG, WebP)
     
+    Staff users can send ``X-GeoLens-Profile: 1`` (or ``?profile=1``) to
+    have the request profiled; see ``manage.py profiles``.
+    
     Returns:
     - JSON with location data (EXIF or ML estimate)
     """
@@ -43,40 +63,37 @@ def upload_image(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Create temporary file
-    temp_dir = tempfile.mkdtemp()
+    # Create temporary file. When originals are retained it is staged inside
+    # the store so it can be renamed into place afterwards.
+    retain_original = settings.RETAIN_ORIGINALS
+    temp_dir = create_staging_dir() if retain_original else tempfile.mkdtemp()
     safe_filename = get_safe_filename(file.name)
     temp_path = os.path.join(temp_dir, safe_filename)
     
     try:
         # Save uploaded file to temporary location
+        digest = hashlib.sha256() if retain_original else None
         with open(temp_path, 'wb') as temp_file:
             for chunk in file.chunks():
                 temp_file.write(chunk)
+                if digest:
+                    digest.update(chunk)
         
-        # Try to extract EXIF GPS data first
-        exif_result = extract_gps_from_exif(temp_path)
+        with cpu_time_limit(settings.EXTRACTION_CPU_TIME_LIMIT):
+            result = process_image(temp_path)
         
-        if exif_result:
-            # Return EXIF GPS data
-            result = {
-                'type': 'EXIF',
-                'lat': exif_result['lat'],
-                'lng': exif_result['lng'],
-                'accuracy': exif_result['accuracy'],
-                'source': exif_result['source'],
-                'exif': exif_result['exif']
-            }
-        else:
-            # Fall back to ML estimation
-            estimate_result = geolocate_image(temp_path)
-            result = {
-                'type': 'ESTIMATE',
-                'lat': estimate_result['lat'],
-                'lng': estimate_result['lng'],
-                'confidence': estimate_result['confidence'],
-                'source': estimate_result['source']
-            }
+        # Only keep the original once a result row references it; failed
+        # extractions leave nothing behind in the store
+        if retain_original:
+            original_sha256 = digest.hexdigest()
+            with transaction.atomic():
+                UploadResult.objects.create(
+                    file_name=file.name[:255],
+                    file_size=file.size,
+                    original_sha256=original_sha256,
+                    **result_model_fields(result)
+                )
+                commit_original(temp_path, original_sha256)
         
         # Validate result with serializer
         serializer = LocationResultSerializer(data=result)
@@ -88,6 +105,12 @@ def upload_image(request):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
             
+    except ExtractionTimeout as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    
     except Exception as e:
         return Response(
             {'error': f'Processing failed: {str(e)}'},
@@ -104,6 +127,116 @@ def upload_image(request):
             pass  # Ignore cleanup errors
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def result_detail(request, pk):
+    """
+    Return a stored upload result.
+    
+    Query parameters:
+    - exif: set to 1 to include the EXIF payload
+    
+    Responses carry a strong ETag derived from the content; repeat requests
+    with a matching If-None-Match get 304 Not Modified.
+    """
+    upload_result = get_object_or_404(UploadResult, pk=pk)
+    include_exif = request.query_params.get('exif', '').lower() in ('1', 'true', 'yes')
+    data = UploadResultSerializer(upload_result, context={'include_exif': include_exif}).data
+    
+    etag = content_etag(data, request.accepted_media_type)
+    matched = matching_etag(request, etag)
+    if matched:
+        # The 304 is never compressed, so repeat the tag of the cached
+        # representation, including its coding suffix
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = matched
+    else:
+        response = Response(data, status=status.HTTP_200_OK)
+        response['ETag'] = etag
+    
+    patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+    return response
+
+
+def _parse_export_datetime(value):
+    """
+    Parse an ISO 8601 filter value, treating naive values as server time (UTC).
+    """
+    parsed = parse_datetime(value)
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+@renderer_classes([NDJSONRenderer, GeoJSONRenderer, CSVRenderer])
+def export_results(request):
+    """
+    Stream stored upload results for bulk export.
+    
+    Query parameters:
+    - format: ndjson (default), geojson or csv
+    - since / until: ISO 8601 bounds on created_at (until is exclusive)
+    - type: EXIF or ESTIMATE
+    - exif: set to 1 to include the EXIF payload
+    
+    Without ``?format=`` the format is chosen with the Accept header; an
+    explicit format takes precedence over Accept. An unknown ``?format=``
+    value gets 404 Not Found.
+    
+    The body is gzip-compressed when the client accepts gzip.
+    """
+    export_format = request.accepted_renderer.format
+    
+    queryset = UploadResult.objects.order_by('created_at', 'id')
+    
+    for param, lookup in (('since', 'created_at__gte'), ('until', 'created_at__lt')):
+        value = request.query_params.get(param)
+        if not value:
+            continue
+        parsed = _parse_export_datetime(value)
+        if parsed is None:
+            return Response(
+                {'error': f'Invalid {param} value, expected an ISO 8601 datetime'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = queryset.filter(**{lookup: parsed})
+    
+    result_type = request.query_params.get('type')
+    if result_type:
+        result_type = result_type.upper()
+        allowed_types = [choice[0] for choice in UploadResult._meta.get_field('result_type').choices]
+        if result_type not in allowed_types:
+            return Response(
+                {'error': f"Invalid type {result_type}. Allowed types: {', '.join(allowed_types)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = queryset.filter(
+            Q(result_type=result_type) | Q(kind=RESULT_KINDS[result_type])
+        )
+    
+    include_exif = request.query_params.get('exif', '').lower() in ('1', 'true', 'yes')
+    compress = 'gzip' in accepted_codings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    
+    stream = stream_export(
+        queryset,
+        export_format,
+        include_exif=include_exif,
+        chunk_size=settings.EXPORT_CHUNK_SIZE,
+        compress=compress
+    )
+    if isinstance(request._request, ASGIRequest):
+        stream = aiter_stream(stream)
+    
+    response = StreamingHttpResponse(stream, content_type=EXPORT_CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = f'attachment; filename="results.{export_format}"'
+    response['Vary'] = 'Accept-Encoding'
+    if compress:
+        response['Content-Encoding'] = 'gzip'
+    return response
+
+
 @api_view(['GET'])
 def health_check(request):
     """
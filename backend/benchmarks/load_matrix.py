@@ -0,0 +1,152 @@
+"""
+Load-test matrix for the gunicorn worker profiles.
+
+For every profile in gunicorn.conf.py this starts a server, then fires a
+fixed number of concurrent uploads at ``/api/upload/`` for each EXIF-hit
+ratio (the share of images that carry GPS EXIF data; the rest fall through
+to the geolocation estimate). It prints throughput and latency per cell so
+the winning profile for a given traffic mix can be read off the table.
+
+Run from the backend directory against a migrated database with an API user:
+
+    python manage.py migrate
+    python manage.py create_api_user
+    python benchmarks/load_matrix.py --token <token>
+"""
+import argparse
+import io
+import os
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from startup import free_port, wait_for_first_response  # noqa: E402
+
+
+def make_jpeg(with_gps: bool) -> bytes:
+    """
+    Build a small JPEG, optionally tagged with GPS EXIF coordinates.
+    """
+    from PIL import Image
+
+    image = Image.new('RGB', (640, 480), color='red')
+    buffer = io.BytesIO()
+    if with_gps:
+        exif = Image.Exif()
+        exif[0x8825] = {
+            1: 'N', 2: (40.0, 42.0, 30.0),
+            3: 'W', 4: (74.0, 0.0, 21.6),
+        }
+        image.save(buffer, 'JPEG', exif=exif)
+    else:
+        image.save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def build_multipart(payload: bytes, filename: str):
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        'Content-Type: image/jpeg\r\n\r\n'
+    ).encode() + payload + f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def upload(url: str, token: str, body: bytes, content_type: str):
+    request = urllib.request.Request(url, data=body, method='POST', headers={
+        'Authorization': f'Token {token}',
+        'Content-Type': content_type,
+    })
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def run_cell(url: str, token: str, ratio: float, total: int, concurrency: int, bodies):
+    hits = int(round(total * ratio))
+    mix = [True] * hits + [False] * (total - hits)
+    random.Random(0).shuffle(mix)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda with_gps: upload(url, token, *bodies[with_gps]), mix))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return total / elapsed, statistics.median(latencies), p95, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--token', default=os.environ.get('GEOLENS_API_TOKEN'),
+                        help='API token (default: $GEOLENS_API_TOKEN)')
+    parser.add_argument('--profiles', default='exif,estimate,async')
+    parser.add_argument('--ratios', default='0,0.5,0.9,1.0',
+                        help='Comma-separated EXIF-hit ratios')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per cell')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Override GUNICORN_WORKERS for every profile')
+    args = parser.parse_args()
+
+    if not args.token:
+        parser.error('an API token is required (--token or $GEOLENS_API_TOKEN)')
+
+    bodies = {
+        True: build_multipart(make_jpeg(with_gps=True), 'gps.jpg'),
+        False: build_multipart(make_jpeg(with_gps=False), 'plain.jpg'),
+    }
+    ratios = [float(ratio) for ratio in args.ratios.split(',')]
+
+    print(f"{'profile':<10} {'exif ratio':>10} {'req/s':>8} {'p50 ms':>8} "
+          f"{'p95 ms':>8} {'errors':>7}")
+    for profile in args.profiles.split(','):
+        port = free_port()
+        env = dict(
+            os.environ,
+            GUNICORN_PROFILE=profile,
+            GUNICORN_BIND=f'127.0.0.1:{port}',
+            DJANGO_DEBUG='False',
+        )
+        if args.workers:
+            env['GUNICORN_WORKERS'] = str(args.workers)
+
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '--log-level', 'warning'],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL
+        )
+        try:
+            wait_for_first_response(f'http://127.0.0.1:{port}/api/health/', 60)
+            url = f'http://127.0.0.1:{port}/api/upload/'
+            for ratio in ratios:
+                throughput, p50, p95, errors = run_cell(
+                    url, args.token, ratio, args.requests, args.concurrency, bodies
+                )
+                print(f'{profile:<10} {ratio:10.2f} {throughput:8.1f} {p50 * 1000:8.0f} '
+                      f'{p95 * 1000:8.0f} {errors:7d}')
+        finally:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=60)
+
+
+if __name__ == '__main__':
+    main()
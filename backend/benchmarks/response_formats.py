@@ -0,0 +1,113 @@
+"""
+Payload size and CPU benchmark for the API response formats.
+
+Renders representative payloads (a single EXIF upload result and a page of
+stored results with EXIF) with the JSON, MessagePack and CBOR renderers,
+optionally compressed with gzip or brotli, and reports the body size and the
+time to encode and decode each combination.
+
+Run from the backend directory:
+
+    python benchmarks/response_formats.py --iterations 2000
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+import brotli  # noqa: E402
+import cbor2  # noqa: E402
+import msgpack  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.middleware.gzip import GZipMiddleware  # noqa: E402
+from django.utils.text import compress_string  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.renderers import CBORRenderer, MessagePackRenderer  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from result_storage import synthetic_result  # noqa: E402
+
+FORMATS = [
+    ('json', JSONRenderer(), json.loads),
+    ('msgpack', MessagePackRenderer(), msgpack.unpackb),
+    ('cbor', CBORRenderer(), cbor2.loads),
+]
+
+CODINGS = [
+    ('identity', lambda body: body, lambda body: body),
+    ('gzip', lambda body: compress_string(body, max_random_bytes=GZipMiddleware.max_random_bytes),
+     gzip.decompress),
+    ('br', lambda body: brotli.compress(body, quality=settings.BROTLI_QUALITY), brotli.decompress),
+]
+
+
+def build_payloads():
+    rng = random.Random(0)
+
+    lat, lng, exif = synthetic_result(rng)
+    upload = {
+        'type': 'EXIF', 'lat': lat, 'lng': lng, 'accuracy': 5.0,
+        'source': 'EXIF', 'exif': exif,
+    }
+
+    page = []
+    for index in range(100):
+        lat, lng, exif = synthetic_result(rng)
+        page.append({
+            'id': index + 1, 'created_at': '2024-06-01T12:00:00.000000Z',
+            'file_name': f'IMG_{index:07d}.jpg', 'file_size': rng.randint(10 ** 5, 10 ** 7),
+            'result_type': 'EXIF', 'latitude': lat, 'longitude': lng,
+            'accuracy': 5.0, 'confidence': None, 'exif_data': exif,
+        })
+
+    return [('upload result', upload), ('100 results', page)]
+
+
+def time_per_call(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iterations', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'payload':<14} {'format':<8} {'coding':<9} {'bytes':>8} "
+          f"{'vs json':>8} {'encode us':>10} {'decode us':>10}")
+    for label, payload in build_payloads():
+        baseline = None
+        for format_name, renderer, decode in FORMATS:
+            for coding_name, compress, decompress in CODINGS:
+                body = compress(renderer.render(payload))
+                if baseline is None:
+                    baseline = len(body)
+
+                encode_time = time_per_call(
+                    lambda: compress(renderer.render(payload)), args.iterations
+                )
+                decode_time = time_per_call(
+                    lambda: decode(decompress(body)), args.iterations
+                )
+                print(f'{label:<14} {format_name:<8} {coding_name:<9} {len(body):8d} '
+                      f'{len(body) / baseline:8.2f} {encode_time * 1e6:10.1f} '
+                      f'{decode_time * 1e6:10.1f}')
+
+
+if __name__ == '__main__':
+    main()
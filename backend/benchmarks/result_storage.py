@@ -0,0 +1,121 @@
+"""
+Size and scan-speed benchmark for the legacy and compact result storage.
+
+Fills a throwaway test database with the same synthetic EXIF results in each
+representation, then reports the table size (including indexes) and the
+time to scan every row through the export path, with and without the EXIF
+payload. Uses the configured database engine (SQLite or PostgreSQL).
+
+Run from the backend directory:
+
+    python benchmarks/result_storage.py --rows 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+from api.compact import compact_fields  # noqa: E402
+from api.export import get_export_fields, iter_result_rows  # noqa: E402
+from api.models import UploadResult  # noqa: E402
+
+
+def synthetic_result(rng: random.Random):
+    lat = rng.uniform(-90, 90)
+    lng = rng.uniform(-180, 180)
+    exif = {
+        'GPS GPSVersionID': '[2, 2, 0, 0]',
+        'GPS GPSLatitudeRef': 'N' if lat >= 0 else 'S',
+        'GPS GPSLatitude': f'[{int(abs(lat))}, {rng.randint(0, 59)}, {rng.randint(0, 5999)}/100]',
+        'GPS GPSLongitudeRef': 'E' if lng >= 0 else 'W',
+        'GPS GPSLongitude': f'[{int(abs(lng))}, {rng.randint(0, 59)}, {rng.randint(0, 5999)}/100]',
+        'GPS GPSAltitudeRef': '0',
+        'GPS GPSAltitude': f'{rng.randint(0, 400000)}/100',
+        'GPS GPSTimeStamp': f'[{rng.randint(0, 23)}, {rng.randint(0, 59)}, {rng.randint(0, 59)}]',
+        'GPS GPSDate': '2024:06:01',
+    }
+    return lat, lng, exif
+
+
+def table_size_bytes() -> int:
+    table = UploadResult._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('ANALYZE ' + table)
+            cursor.execute('SELECT pg_total_relation_size(%s)', [table])
+            return cursor.fetchone()[0]
+
+        cursor.execute(
+            'SELECT SUM(pgsize) FROM dbstat WHERE name = %s OR name IN '
+            '(SELECT name FROM sqlite_master WHERE type = %s AND tbl_name = %s)',
+            [table, 'index', table]
+        )
+        return cursor.fetchone()[0] or 0
+
+
+def reset_table() -> None:
+    UploadResult.objects.all().delete()
+    with connection.cursor() as cursor:
+        cursor.execute('VACUUM' if connection.vendor == 'sqlite' else 'SELECT 1')
+
+
+def fill(rows: int, compact: bool, batch_size: int = 5000) -> None:
+    rng = random.Random(0)
+    batch = []
+    for index in range(rows):
+        lat, lng, exif = synthetic_result(rng)
+        if compact:
+            fields = compact_fields('EXIF', lat, lng, exif)
+        else:
+            fields = {'result_type': 'EXIF', 'latitude': lat, 'longitude': lng, 'exif_data': exif}
+        batch.append(UploadResult(
+            file_name=f'IMG_{index:07d}.jpg', file_size=rng.randint(10 ** 5, 10 ** 7),
+            accuracy=5, **fields
+        ))
+        if len(batch) >= batch_size:
+            UploadResult.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        UploadResult.objects.bulk_create(batch)
+
+
+def scan_seconds(include_exif: bool) -> float:
+    start = time.perf_counter()
+    for _ in iter_result_rows(UploadResult.objects.all(), get_export_fields(include_exif), 2000):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        print(f"{'storage':<9} {'size MB':>9} {'bytes/row':>10} "
+              f"{'scan s':>8} {'scan+exif s':>12}")
+        for compact in (False, True):
+            reset_table()
+            fill(args.rows, compact)
+            size = table_size_bytes()
+            print(f"{'compact' if compact else 'legacy':<9} {size / 2 ** 20:9.1f} "
+                  f"{size / args.rows:10.0f} {scan_seconds(False):8.2f} "
+                  f"{scan_seconds(True):12.2f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+Cold-start benchmark for the backend.
+
+Starts gunicorn with and without ``--preload`` and reports the time until the
+first HTTP request is answered, plus the resident (RSS) and proportional
+(PSS) memory of every worker. PSS splits shared pages between the processes
+sharing them, so it shows how much copy-on-write sharing the preloaded master
+buys. Optionally prints the slowest imports from ``python -X importtime``.
+
+Linux only (reads /proc). Run from the backend directory:
+
+    python benchmarks/startup.py --workers 4
+    python benchmarks/startup.py --importtime
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_first_response(url: str, timeout: float) -> float:
+    """
+    Poll ``url`` until the server answers and return the elapsed time.
+    Any HTTP status counts as an answer.
+    """
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            urllib.request.urlopen(url, timeout=1).close()
+            return time.perf_counter() - start
+        except urllib.error.HTTPError:
+            return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.01)
+    raise RuntimeError(f'Server did not answer within {timeout} seconds')
+
+
+def child_pids(parent_pid: int):
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces, so split after it
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == parent_pid:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def memory_kb(pid: int):
+    """
+    Return (rss_kb, pss_kb) for a process.
+    """
+    rss = pss = 0
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                rss = int(line.split()[1])
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    pss = int(line.split()[1])
+    except OSError:
+        pass  # Kernels before 4.14 have no smaps_rollup
+    return rss, pss
+
+
+def run_mode(preload: bool, workers: int, timeout: float):
+    port = free_port()
+    command = [
+        sys.executable, '-m', 'gunicorn',
+        '--bind', f'127.0.0.1:{port}',
+        '--workers', str(workers),
+        '--log-level', 'warning',
+    ]
+    if preload:
+        command.append('--preload')
+    command.append('project.wsgi:application')
+
+    env = dict(os.environ, DJANGO_DEBUG='False')
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    try:
+        ttfr = wait_for_first_response(f'http://127.0.0.1:{port}/api/health/', timeout)
+
+        # Wait for every worker to finish booting before measuring memory
+        deadline = time.perf_counter() + timeout
+        pids = child_pids(process.pid)
+        while len(pids) < workers and time.perf_counter() < deadline:
+            time.sleep(0.05)
+            pids = child_pids(process.pid)
+        for _ in range(workers * 2):
+            _touch(f'http://127.0.0.1:{port}/api/health/')
+        time.sleep(0.5)
+
+        master = memory_kb(process.pid)
+        worker_memory = [memory_kb(pid) for pid in pids]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+    return ttfr, master, worker_memory
+
+
+def _touch(url: str) -> None:
+    try:
+        urllib.request.urlopen(url, timeout=5).close()
+    except urllib.error.HTTPError:
+        pass
+
+
+def report_importtime(limit: int) -> None:
+    """
+    Print the slowest imports (cumulative) when loading the web app.
+    """
+    code = (
+        "import os, django;"
+        "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings');"
+        "django.setup();"
+        "import project.urls"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        rows.append((int(cumulative_us), int(self_us), name))
+
+    rows.sort(reverse=True)
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in rows[:limit]:
+        print(f'{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--importtime', action='store_true',
+                        help='Print the slowest imports instead of starting gunicorn')
+    parser.add_argument('--limit', type=int, default=25,
+                        help='Number of imports to print with --importtime')
+    args = parser.parse_args()
+
+    if args.importtime:
+        report_importtime(args.limit)
+        return
+
+    print(f"{'mode':<12} {'first req ms':>12} {'master RSS MB':>14} "
+          f"{'worker RSS MB':>14} {'worker PSS MB':>14}")
+    for preload in (False, True):
+        ttfr, master, workers = run_mode(preload, args.workers, args.timeout)
+        worker_rss = sum(rss for rss, _ in workers) / max(len(workers), 1) / 1024
+        worker_pss = sum(pss for _, pss in workers) / max(len(workers), 1) / 1024
+        print(f"{'preload' if preload else 'no-preload':<12} {ttfr * 1000:12.0f} "
+              f"{master[0] / 1024:14.1f} {worker_rss:14.1f} {worker_pss:14.1f}")
+
+
+if __name__ == '__main__':
+    main()
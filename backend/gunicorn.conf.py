@@ -0,0 +1,91 @@
+"""
+Gunicorn configuration for the GeoLens backend.
+
+Gunicorn loads this file automatically when started from the backend
+directory. ``GUNICORN_PROFILE`` selects a worker model:
+
+- ``exif`` (default): sync process workers, one per core. Best when most
+  uploads carry GPS EXIF data and requests are CPU-bound.
+- ``estimate``: gthread workers. Best when most uploads fall through to the
+  geolocation estimate, which spends its time waiting on I/O. Requests run
+  off the main thread, so ``EXTRACTION_CPU_TIME_LIMIT`` is not enforced.
+- ``async``: uvicorn workers serving the ASGI application. Every view is
+  synchronous and runs on an executor thread, so this gives no extra
+  request concurrency, and ``EXTRACTION_CPU_TIME_LIMIT`` is not enforced.
+  Keep CPU-bound upload traffic on ``exif``. Exports still stream in
+  constant memory (see ``api.export.aiter_stream``), but each chunk costs a
+  thread hop.
+
+Every setting can be overridden from the environment; see env.example.
+"""
+import os
+
+# Imported under another name: gunicorn reads every module-level name that
+# matches one of its settings, and 'config' is one of them
+from decouple import config as env
+
+
+def _cpu_count() -> int:
+    # Respect CPU affinity (container cpusets) where the platform exposes it
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+CORES = _cpu_count()
+
+PROFILES = {
+    'exif': {
+        'wsgi_app': 'project.wsgi:application',
+        'worker_class': 'sync',
+        'workers': CORES,
+        'threads': 1,
+        'timeout': 30,
+    },
+    # No CPU time limit (requests run on worker threads)
+    'estimate': {
+        'wsgi_app': 'project.wsgi:application',
+        'worker_class': 'gthread',
+        'workers': CORES,
+        'threads': 8,
+        'timeout': 60,
+        'keepalive': 5,
+    },
+    # No CPU time limit (views run off the main thread); see the docstring
+    'async': {
+        'wsgi_app': 'project.asgi:application',
+        'worker_class': 'uvicorn.workers.UvicornWorker',
+        'workers': CORES,
+        'threads': 1,
+        'timeout': 60,
+        'keepalive': 5,
+    },
+}
+
+profile_name = env('GUNICORN_PROFILE', default='exif')
+if profile_name not in PROFILES:
+    raise RuntimeError(
+        f"Unknown GUNICORN_PROFILE {profile_name}. Allowed profiles: {', '.join(PROFILES)}"
+    )
+profile = PROFILES[profile_name]
+
+wsgi_app = profile['wsgi_app']
+bind = env('GUNICORN_BIND', default='0.0.0.0:8000')
+worker_class = profile['worker_class']
+workers = env('GUNICORN_WORKERS', default=profile['workers'], cast=int)
+threads = env('GUNICORN_THREADS', default=profile['threads'], cast=int)
+
+# Recycle workers periodically; the jitter stops them all restarting at once
+max_requests = env('GUNICORN_MAX_REQUESTS', default=1000, cast=int)
+max_requests_jitter = env('GUNICORN_MAX_REQUESTS_JITTER', default=100, cast=int)
+
+timeout = env('GUNICORN_TIMEOUT', default=profile['timeout'], cast=int)
+graceful_timeout = env('GUNICORN_GRACEFUL_TIMEOUT', default=30, cast=int)
+
+# Sync workers close the connection after each response, so keep-alive only
+# applies to the estimate and async profiles
+if 'keepalive' in profile:
+    keepalive = env('GUNICORN_KEEPALIVE', default=profile['keepalive'], cast=int)
+
+# Load the app in the master so workers share the warmed state (api/warmup.py)
+preload_app = env('GUNICORN_PRELOAD', default=True, cast=bool)
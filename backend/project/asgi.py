@@ -4,8 +4,15 @@ ASGI config for GeoLens project.
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 
 application = get_asgi_application()
+
+# Warm heavy modules and caches once per process. With gunicorn --preload
+# this runs in the master and workers inherit the state copy-on-write.
+if settings.WARM_UP_ON_STARTUP:
+    from api.warmup import warm_up
+    warm_up()
@@ -33,6 +33,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -108,6 +109,27 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = config('MEDIA_URL', default='/media/')
 MEDIA_ROOT = BASE_DIR / config('MEDIA_ROOT', default='uploads')
 
+# Keep uploaded originals in a content-addressed store for reprocessing.
+# Kept outside MEDIA_ROOT, which is served without authentication in DEBUG.
+RETAIN_ORIGINALS = config('RETAIN_ORIGINALS', default=False, cast=bool)
+ORIGINALS_ROOT = BASE_DIR / config('ORIGINALS_DIR', default='originals')
+
+# Per-request profiling (staff-only, see api/profiling.py)
+PROFILE_DIR = BASE_DIR / config('PROFILE_DIR', default='profiles')
+PROFILE_RING_SIZE = config('PROFILE_RING_SIZE', default=50, cast=int)
+
+# Store new results in the compact representation (see api/compact.py);
+# convert existing rows with "manage.py compact_results". Result rows are only
+# recorded for uploads under RETAIN_ORIGINALS (and by reprocess_originals), so
+# this has no effect while retention is off.
+COMPACT_RESULT_STORAGE = config('COMPACT_RESULT_STORAGE', default=False, cast=bool)
+
+# Bulk export (rows fetched per database round trip)
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Import heavy modules and warm caches when the WSGI/ASGI app is loaded
+WARM_UP_ON_STARTUP = config('WARM_UP_ON_STARTUP', default=True, cast=bool)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -121,9 +143,25 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
+        'api.renderers.MessagePackRenderer',
+        'api.renderers.CBORRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        'api.parsers.MessagePackParser',
+        'api.parsers.CBORParser',
     ],
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS': 'api.negotiation.FormatOverrideNegotiation',
 }
 
+# Response compression (see api/middleware.py)
+# Only token-authenticated API results; never pages with CSRF tokens (BREACH)
+RESPONSE_COMPRESSION_PATHS = ['/api/results/']
+RESPONSE_COMPRESSION_MIN_SIZE = config('RESPONSE_COMPRESSION_MIN_SIZE', default=1024, cast=int)
+BROTLI_QUALITY = config('BROTLI_QUALITY', default=5, cast=int)
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = config('CORS_ALLOWED_ORIGINS', default='http://localhost:3000,http://127.0.0.1:3000').split(',')
 
@@ -134,3 +172,10 @@ SECURE_PROXY_SSL_HEADER = config('SECURE_PROXY_SSL_HEADER', default=None)
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10 MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10 MB
+
+# Header-only budgets checked before an upload is parsed (see api/guards.py)
+IMAGE_MAX_PIXELS = config('IMAGE_MAX_PIXELS', default=50_000_000, cast=int)
+IMAGE_MAX_IFD_ENTRIES = config('IMAGE_MAX_IFD_ENTRIES', default=1000, cast=int)
+IMAGE_MAX_METADATA_BYTES = config('IMAGE_MAX_METADATA_BYTES', default=512 * 1024, cast=int)
+# CPU seconds allowed for extraction per request (sync workers only; 0 disables)
+EXTRACTION_CPU_TIME_LIMIT = config('EXTRACTION_CPU_TIME_LIMIT', default=2.0, cast=float)